@@ -0,0 +1,137 @@
+import os
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from api.service.bulk_service import DEFAULT_CHUNK_SIZE, ingest_entries, iter_archive, iter_directory, parse_manifest
+from api.service.dataset_pack import PACKED_ROOT, SPLITS, pack_split
+from api.service.job_worker import run_worker, start_worker_pool
+from api.service.model_export import check_parity, export_model
+from api.service.model_registry import BACKENDS, MODEL_SPECS, registry_stats, warm_up
+from api.service.stats_service import rebuild_stats
+from api.service.video_service import process_video
+
+# `flask detections <command>`
+detections_cli = AppGroup('detections', help='Detection service commands.')
+
+
+@detections_cli.command('worker')
+@click.option('--processes', '-p', default=2, show_default=True, help='Number of inference worker processes.')
+@click.option('--poll-interval', default=0.5, show_default=True, help='Seconds to sleep when the queue is empty.')
+def worker_command(processes, poll_interval):
+    """Async detection jobs प्रशोधन गर्ने worker pool सुरु गर्छ।"""
+    click.echo(f"Starting {processes} detection worker(s) on {current_app.config['JOB_QUEUE_PATH']}")
+    if processes == 1:
+        warm_up()
+        run_worker(current_app._get_current_object(), poll_interval)
+    else:
+        start_worker_pool(processes, poll_interval)
+
+
+@detections_cli.command('warmup')
+def warmup_command():
+    """दुवै मोडल load र warm-up गरेर समय देखाउँछ।"""
+    warm_up()
+    for name, stats in registry_stats()['models'].items():
+        click.echo(f"{name}: load {stats['load_ms']} ms, warm-up {stats['warmup_ms']} ms")
+
+
+@detections_cli.command('export-models')
+@click.option('--format', 'fmt', type=click.Choice(['onnx', 'openvino']), default='onnx', show_default=True)
+@click.option('--int8', is_flag=True, help='Also quantize to INT8 (calibrated on the valid split).')
+@click.option('--model', 'names', multiple=True, type=click.Choice(sorted(MODEL_SPECS)), help='Defaults to both models.')
+def export_models_command(fmt, int8, names):
+    """PyTorch checkpoints लाई तालिमको imgsz मा ONNX/OpenVINO मा export गर्छ।"""
+    for name in names or sorted(MODEL_SPECS):
+        path = export_model(name, fmt, int8=int8)
+        click.echo(f"{name}: exported {fmt}{' int8' if int8 else ''} -> {path}")
+    click.echo('Select the runtime with INFERENCE_BACKEND=' + '|'.join(BACKENDS))
+
+
+@detections_cli.command('check-parity')
+@click.option('--backend', type=click.Choice([b for b in BACKENDS if b != 'pytorch']), default='onnx', show_default=True)
+@click.option('--model', 'names', multiple=True, type=click.Choice(sorted(MODEL_SPECS)), help='Defaults to both models.')
+@click.option('--limit', type=int, default=None, help='Only use the first N test images.')
+@click.option('--min-recall', type=float, default=0.95, show_default=True, help='Fail below this box recall.')
+def check_parity_command(backend, names, limit, min_recall):
+    """Export गरिएको backend लाई PyTorch नतिजासँग dataset को test तस्बिरमा तुलना गर्छ।"""
+    failed = False
+    for name in names or sorted(MODEL_SPECS):
+        stats = check_parity(name, backend, limit=limit)
+        ok = stats['box_recall'] >= min_recall
+        failed = failed or not ok
+        click.echo(
+            f"{name} [{backend}] {'OK' if ok else 'FAIL'}: {stats['images']} images, "
+            f"box recall {stats['box_recall']:.3f}, precision {stats['box_precision']:.3f}, "
+            f"mean IoU {stats['mean_matched_iou']:.3f}, max conf diff {stats['max_conf_diff']:.3f}, "
+            f"decision agreement {stats['decision_agreement']:.3f}"
+        )
+    if failed:
+        raise SystemExit(1)
+
+
+@detections_cli.command('pack-datasets')
+@click.option('--model', 'names', multiple=True, type=click.Choice(sorted(MODEL_SPECS)), help='Defaults to both models.')
+@click.option('--split', 'splits', multiple=True, type=click.Choice(SPLITS), help='Defaults to all splits.')
+@click.option('--output', default=PACKED_ROOT, show_default=True, type=click.Path(file_okay=False), help='Packed dataset folder.')
+@click.option('--limit', type=int, default=None, help='Only pack the first N images per split.')
+@click.option('--force', is_flag=True, help='Re-pack even if the source dataset is unchanged.')
+def pack_datasets_command(names, splits, output, limit, force):
+    """Datasets लाई मोडलको imgsz मा letterboxed memory-mapped arrays (.npy) मा pack गर्छ।"""
+    for name in names or sorted(MODEL_SPECS):
+        for split in splits or SPLITS:
+            meta = pack_split(name, split, root=output, limit=limit, force=force)
+            if meta is None:
+                click.echo(f'{name}/{split}: no images, skipped')
+            elif meta.get('skipped'):
+                click.echo(f'{name}/{split}: up to date ({meta["count"]} images)')
+            else:
+                click.echo(f'{name}/{split}: packed {meta["count"]} images, {meta["labels"]} boxes @ {meta["imgsz"]}')
+    click.echo('Evaluate with: python -m benchmarks packed [--split valid]')
+
+
+@detections_cli.command('ingest')
+@click.argument('source', type=click.Path(exists=True))
+@click.option('--manifest', type=click.Path(exists=True, dir_okay=False), help='CSV/JSON manifest if not inside SOURCE.')
+@click.option('--chunk-size', default=DEFAULT_CHUNK_SIZE, show_default=True, help='Images per inference batch and transaction.')
+def ingest_command(source, manifest, chunk_size):
+    """ZIP/tar archive वा folder का तस्बिरहरू manifest का coordinates सहित bulk ingest गर्छ।"""
+    if manifest:
+        with open(manifest, 'rb') as f:
+            manifest = parse_manifest(f.read(), manifest)
+
+    def progress(items):
+        click.echo(f"  processed {len(items)} images")
+
+    if os.path.isdir(source):
+        summary, items = ingest_entries(iter_directory(source, manifest), chunk_size, on_chunk=progress)
+    else:
+        with open(source, 'rb') as f:
+            summary, items = ingest_entries(iter_archive(f, manifest), chunk_size, on_chunk=progress)
+
+    for item in items:
+        if item['status'] == 'error':
+            click.echo(f"  {item['filename']}: {item['error']}", err=True)
+    click.echo('Summary: ' + ', '.join(f'{status}={count}' for status, count in sorted(summary.items())))
+
+
+@detections_cli.command('video')
+@click.argument('video', type=click.Path(exists=True, dir_okay=False))
+@click.option('--track', type=click.Path(exists=True, dir_okay=False), help='GPS sidecar (CSV/JSON with t, latitude, longitude).')
+@click.option('--location', help='Location label stored on each detection.')
+@click.option('--batch-size', default=8, show_default=True, help='Sampled frames per inference batch.')
+def video_command(video, track, location, batch_size):
+    """Dashcam video लाई frame sampling र motion gating सहित प्रशोधन गर्छ।"""
+    summary = process_video(video, track, location, batch_size=batch_size)
+    click.echo(
+        f"{summary['frames_sampled']}/{summary['frames_total']} frames sampled "
+        f"(distance/time skipped {summary['skipped_distance']}, motion skipped {summary['skipped_motion']}); "
+        f"created {summary['detections']['created']}, merged {summary['detections']['merged']}; "
+        f"{summary['elapsed_s']} s for {summary.get('duration_s')} s of video"
+    )
+
+
+@detections_cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """detection_stats rollups लाई detections tables बाट पूरै पुनः गणना गर्छ।"""
+    counts = rebuild_stats()
+    click.echo('Rebuilt stats: ' + ', '.join(f'{name}={count}' for name, count in sorted(counts.items())))
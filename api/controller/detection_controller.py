@@ -1,8 +1,19 @@
-import os
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, current_app, request, jsonify, send_file, stream_with_context, url_for
 from database import db
 from api.models.detection_model import Pothole, Waste
-from api.service.detection_service import detect_image_type
+from api.service.admission import AdmissionRejected, admission_stats
+from api.service.bulk_service import DEFAULT_CHUNK_SIZE, ingest_entries, iter_archive, iter_uploads, parse_manifest
+from api.service.dedup_cache import dedup_stats
+from api.service.image_service import FORMATS, KINDS, SIZES, resolve_image, variant_stats
+from api.service.inference_engine import batching_stats
+from api.service.ingest_service import DUPLICATE, MERGED, ingest_upload
+from api.service.job_worker import enqueue_detection_job, enqueue_video_job, get_job_status
+from api.service.metrics import span
+from api.service.model_registry import ModelLoadError, registry_stats
+from api.service.query_service import fetch_page, iter_rows, parse_filters
+from api.service.spatial_service import MAX_RESULTS, nearest, within_bbox, within_radius
+from api.service.stats_service import get_stats
+from api.service.write_buffer import write_buffer_stats
 
 # Base Blueprint
 detection_bp = Blueprint('detection_bp', __name__, url_prefix='/detections')
@@ -10,6 +21,14 @@ detection_bp = Blueprint('detection_bp', __name__, url_prefix='/detections')
 # NOTE: स्थानीय UPLOAD_FOLDER परिभाषा हटाइएको छ, Flask कन्फिगरेसन प्रयोग गरिनेछ।
 
 
+def busy_response(error):
+    """Overload: inference slot नपाएको request लाई 503 + Retry-After।"""
+    response = jsonify({'error': str(error), 'reason': error.reason})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
 # ---------------- POST: Detect and save ----------------
 @detection_bp.route('/', methods=['POST'])
 def detect():
@@ -29,94 +48,189 @@ def detect():
         return jsonify({'error': 'Latitude and Longitude must be valid numbers'}), 400
     # ... (सुरुवाती validation र data extraction कोड समाप्त)
 
+    # ---------- Async mode: job queue मा राखेर तुरुन्तै 202 फर्काउने ----------
+    if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+        job_id = enqueue_detection_job(image, location, latitude, longitude)
+        return jsonify({
+            'message': 'Detection job queued',
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': url_for('detection_bp.get_job', job_id=job_id)
+        }), 202
 
-    detection_type, result_data = detect_image_type(image)
+    with span('upload_read'):
+        data = image.read()
+    try:
+        detection_type, record, outcome = ingest_upload(
+            data, image.filename, location, latitude, longitude
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except ModelLoadError as e:
+        return jsonify({'error': str(e)}), 503
+    except AdmissionRejected as e:
+        return busy_response(e)
 
     if not detection_type:
-        return jsonify({'message': 'No pothole or waste detected in the image'}), 200
-    
-    # Flask कन्फिगरेसनबाट UPLOAD_FOLDER लिने
-    UPLOAD_FOLDER = current_app.config.get('UPLOAD_FOLDER')
-    if not UPLOAD_FOLDER:
-        return jsonify({'error': 'UPLOAD_FOLDER is not configured in Flask app'}), 500
-
-    # Filenames from service (यी UPLOAD_FOLDER भित्रका अस्थायी नामहरू हुन्)
-    temp_original_filename = result_data['image_name']
-    temp_detected_filename = result_data['detected_image_path']
-
-    # --- Create directories and paths ---
-    original_folder = os.path.join(UPLOAD_FOLDER, detection_type, "original")
-    detected_folder = os.path.join(UPLOAD_FOLDER, detection_type, "detected")
-    os.makedirs(original_folder, exist_ok=True)
-    os.makedirs(detected_folder, exist_ok=True)
-
-    # 1. Move the original uploaded image from temp location to final 'original' folder
-    temp_original_path = os.path.join(UPLOAD_FOLDER, temp_original_filename)
-    final_original_path = os.path.join(original_folder, temp_original_filename)
-    
-    if os.path.exists(temp_original_path):
-        # os.rename प्रयोग गरेर अस्थायी फाइललाई 'original' फोल्डरमा सार्ने
-        os.rename(temp_original_path, final_original_path)
-    else:
-        # Service ले बचत नगरेको खण्डमा त्रुटि
-        return jsonify({'error': 'Uploaded image file was not found after detection'}), 500
-    
-    
-    final_detected_image_path_db = None
-    
-    # 2. Move the detected (annotated) image from temp location to final 'detected' folder
-    if temp_detected_filename:
-        temp_detected_path = os.path.join(UPLOAD_FOLDER, temp_detected_filename)
-        final_detected_path = os.path.join(detected_folder, temp_detected_filename)
-
-        if os.path.exists(temp_detected_path):
-            # os.rename प्रयोग गरेर पत्ता लागेको फाइललाई 'detected' फोल्डरमा सार्ने
-            os.rename(temp_detected_path, final_detected_path)
-            # DB मा बचत गर्नका लागि अन्तिम पथ
-            final_detected_image_path_db = final_detected_path 
-            
-    # --- Create DB record ---
-    if detection_type == 'pothole':
-        record = Pothole(
-            image_name=temp_original_filename, # सुरक्षित नामको आवश्यकता छैन किनकि service मा timestamp जोडिएको छ
-            detected_image_path=final_detected_image_path_db,
-            location=location,
-            latitude=latitude,
-            longitude=longitude,
-            status=result_data.get('status', 'pending')
-        )
-    elif detection_type == 'waste':
-        record = Waste(
-            image_name=temp_original_filename, # सुरक्षित नामको आवश्यकता छैन
-            detected_image_path=final_detected_image_path_db,
-            location=location,
-            latitude=latitude,
-            longitude=longitude,
-            detection_status=result_data.get('detection_status', 'pending'),
-            is_waste=result_data.get('is_waste', False),
-            waste_category=result_data.get('waste_category', ''),
-            is_recyclable=result_data.get('is_recyclable', False),
-            is_decomposable=result_data.get('is_decomposable', False)
-        )
-    else:
-        return jsonify({'error': 'Invalid detection type from service'}), 500
+        return jsonify({
+            'message': 'No pothole or waste detected in the image',
+            'duplicate': outcome == DUPLICATE
+        }), 200
 
-    db.session.add(record)
-    db.session.commit()
+    # उही तस्बिर पहिले नै प्रशोधन भइसकेको: inference नचलाई बचत भएको नतिजा फर्काउने
+    if outcome == DUPLICATE:
+        return jsonify({
+            'message': f'Duplicate upload, returning stored {detection_type} detection',
+            'duplicate': True,
+            'data': record.to_dict()
+        }), 200
+
+    # उही ठाउँको खुला detection मा रिपोर्ट जोडियो (नयाँ row बनेन)
+    if outcome == MERGED:
+        return jsonify({
+            'message': f'Merged into existing {detection_type} report',
+            'merged': True,
+            'data': record.to_dict()
+        }), 200
 
+    # Service ले फाइलहरू सिधै अन्तिम original/detected फोल्डरमा लेखिसकेको छ
     return jsonify({
         'message': f'{detection_type.capitalize()} detected successfully',
         'data': record.to_dict()
     }), 201
 
 
+# ---------------- POST: Bulk ingestion (dashcam / sweep runs) ----------------
+# archive=<zip|tar> (manifest भित्र वा छुट्टै) वा धेरै images + manifest (CSV/JSON)
+@detection_bp.route('/bulk', methods=['POST'])
+def bulk_detect():
+    manifest = None
+    manifest_file = request.files.get('manifest')
+    try:
+        if manifest_file:
+            manifest = parse_manifest(manifest_file.read(), manifest_file.filename or 'manifest.csv')
+        elif request.form.get('manifest'):
+            manifest = parse_manifest(request.form['manifest'], 'manifest.json')
+
+        archive = request.files.get('archive')
+        if archive:
+            entries = iter_archive(archive.stream, manifest)
+        else:
+            images = request.files.getlist('images')
+            if not images or manifest is None:
+                return jsonify({'error': "Send an 'archive' or 'images' together with a 'manifest'"}), 400
+            entries = iter_uploads(images, manifest)
+
+        chunk_size = min(int(request.args.get('chunk_size', DEFAULT_CHUNK_SIZE)), 64)
+        summary, items = ingest_entries(entries, chunk_size=max(1, chunk_size))
+    except ValueError as e:
+        # Archive/manifest नै पढ्न नसकिएको; chunk भित्रका त्रुटिहरू items मा `error` हुन्छन्
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({'summary': summary, 'items': items}), 200
+
+
+# ---------------- POST: Dashcam video (async job) ----------------
+# video=<file>, track=<CSV/JSON GPS sidecar, optional>, location=<optional>
+@detection_bp.route('/video', methods=['POST'])
+def detect_video():
+    video = request.files.get('video')
+    if not video:
+        return jsonify({'error': "Missing 'video' file"}), 400
+
+    job_id = enqueue_video_job(video, request.files.get('track'), request.form.get('location'))
+    return jsonify({
+        'message': 'Video processing job queued',
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': url_for('detection_bp.get_job', job_id=job_id)
+    }), 202
+
+
 # ... (बाँकी GET, PUT, DELETE routes अपरिवर्तित)
 # ---------------- GET: Retrieve all detections ----------------
+# Query params: type, status, category, since, until, limit, cursor, format=ndjson
 @detection_bp.route('/', methods=['GET'])
 def get_all_detections():
-    potholes = [p.to_dict() for p in Pothole.query.all()]
-    wastes = [w.to_dict() for w in Waste.query.all()]
-    return jsonify({'potholes': potholes, 'wastes': wastes}), 200
+    try:
+        filters = parse_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # NDJSON: rows DB cursor बाट पढ्दै गर्दा नै पठाइन्छ, memory flat रहन्छ
+    if request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson':
+        return Response(stream_with_context(iter_rows(filters)), mimetype='application/x-ndjson'), 200
+
+    page, next_cursor = fetch_page(filters)
+    return jsonify({**page, 'next_cursor': next_cursor}), 200
+
+
+# ---------------- GET: Spatial queries (map viewport / nearby) ----------------
+# bbox=min_lat,min_lon,max_lat,max_lon | lat,lon,radius (m) | lat,lon,k (nearest)
+@detection_bp.route('/nearby', methods=['GET'])
+def get_nearby_detections():
+    args = request.args
+    detection_type = args.get('type')
+    if detection_type and detection_type not in ('pothole', 'waste'):
+        return jsonify({'error': "'type' must be 'pothole' or 'waste'"}), 400
+    types = [detection_type] if detection_type else ['pothole', 'waste']
+
+    try:
+        limit = min(int(args.get('limit', MAX_RESULTS)), MAX_RESULTS)
+        if args.get('bbox'):
+            min_lat, min_lon, max_lat, max_lon = (float(v) for v in args['bbox'].split(','))
+            if min_lat > max_lat or min_lon > max_lon:
+                raise ValueError
+            matches = [(t, r, None) for t, r in within_bbox(types, min_lat, min_lon, max_lat, max_lon, limit)]
+        else:
+            latitude, longitude = float(args['lat']), float(args['lon'])
+            if args.get('k'):
+                matches = nearest(types, latitude, longitude, min(int(args['k']), limit))
+            else:
+                matches = within_radius(types, latitude, longitude, float(args['radius']), limit)
+    except (KeyError, ValueError):
+        return jsonify({
+            'error': 'Use bbox=min_lat,min_lon,max_lat,max_lon or lat, lon and radius (metres) or k'
+        }), 400
+
+    results = []
+    for match_type, record, distance in matches:
+        item = {'type': match_type, **record.to_dict()}
+        if distance is not None:
+            item['distance_m'] = round(distance, 1)
+        results.append(item)
+    return jsonify({'count': len(results), 'results': results}), 200
+
+
+# ---------------- GET: Inference scheduler metrics ----------------
+@detection_bp.route('/inference/stats', methods=['GET'])
+def inference_stats():
+    return jsonify({
+        'models': registry_stats(),
+        'batching': batching_stats(),
+        'dedup': dedup_stats(),
+        'variants': variant_stats(),
+        'admission': admission_stats(),
+        'writes': write_buffer_stats()
+    }), 200
+
+
+# ---------------- GET: Dashboard stats (pre-aggregated rollups) ----------------
+@detection_bp.route('/stats', methods=['GET'])
+def detection_stats():
+    detection_type = request.args.get('type')
+    if detection_type and detection_type not in ('pothole', 'waste'):
+        return jsonify({'error': 'Invalid detection type'}), 400
+    return jsonify(get_stats(detection_type, request.args.get('dimension'))), 200
+
+
+# ---------------- GET: Async detection job status ----------------
+@detection_bp.route('/jobs/<string:job_id>', methods=['GET'])
+def get_job(job_id):
+    job = get_job_status(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job), 200
 
 
 # ---------------- GET: Retrieve single detection by ID ----------------
@@ -131,16 +245,64 @@ def get_detection(detection_type, id):
     return jsonify(record.to_dict()), 200
 
 
+# ---------------- GET: Serve detection image (thumbnail/WebP variants) ----------------
+@detection_bp.route('/<string:detection_type>/<int:id>/image', methods=['GET'])
+def get_detection_image(detection_type, id):
+    if detection_type == 'pothole':
+        record = Pothole.query.get_or_404(id)
+    elif detection_type == 'waste':
+        record = Waste.query.get_or_404(id)
+    else:
+        return jsonify({'error': 'Invalid detection type'}), 400
+
+    kind = request.args.get('kind', 'detected')
+    size = request.args.get('size', 'full')
+    # format नदिए browser ले स्पष्ट रूपमा image/webp भनेको छ भने WebP (*/* ले मात्र होइन)
+    fmt = request.args.get('format')
+    if fmt is None:
+        fmt = 'webp' if 'image/webp' in request.accept_mimetypes.values() else 'jpeg'
+    if kind not in KINDS or size not in SIZES or fmt not in FORMATS:
+        return jsonify({'error': f'kind must be one of {KINDS}, size one of {SIZES}, format one of {tuple(FORMATS)}'}), 400
+
+    # Variant evict भएर हराएमा एक पटक फेरि बनाउने
+    for _ in range(2):
+        resolved = resolve_image(record, kind, size, fmt)
+        if resolved is None:
+            return jsonify({'error': 'Image not found'}), 404
+        path, mimetype = resolved
+        try:
+            # conditional=True: ETag/Last-Modified (304) र Range (206); फाइल sendfile/file_wrapper बाट जान्छ
+            response = send_file(
+                path, mimetype=mimetype, conditional=True, etag=True,
+                max_age=current_app.config.get('IMAGE_CACHE_MAX_AGE', 86400)
+            )
+        except FileNotFoundError:
+            continue
+        if 'format' not in request.args:
+            response.vary.add('Accept')
+        return response
+    return jsonify({'error': 'Image not found'}), 404
+
+
 # ---------------- PUT: Update detection ----------------
 @detection_bp.route('/<string:detection_type>/<int:id>', methods=['PUT'])
 def update_detection(detection_type, id):
     data = request.json
+    # Latitude/longitude string ("27.75") पनि स्वीकार्ने, तर geohash/rollups अघि float मा बदल्ने
+    coordinates = {}
+    for key in ('latitude', 'longitude'):
+        if key in data:
+            try:
+                coordinates[key] = float(data[key]) if data[key] is not None else None
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Latitude and Longitude must be valid numbers'}), 400
+
     if detection_type == 'pothole':
         record = Pothole.query.get_or_404(id)
         record.status = data.get('status', record.status)
         record.location = data.get('location', record.location)
-        record.latitude = data.get('latitude', record.latitude)
-        record.longitude = data.get('longitude', record.longitude)
+        record.latitude = coordinates.get('latitude', record.latitude)
+        record.longitude = coordinates.get('longitude', record.longitude)
     elif detection_type == 'waste':
         record = Waste.query.get_or_404(id)
         record.detection_status = data.get('detection_status', record.detection_status)
@@ -149,8 +311,8 @@ def update_detection(detection_type, id):
         record.is_recyclable = data.get('is_recyclable', record.is_recyclable)
         record.is_decomposable = data.get('is_decomposable', record.is_decomposable)
         record.location = data.get('location', record.location)
-        record.latitude = data.get('latitude', record.latitude)
-        record.longitude = data.get('longitude', record.longitude)
+        record.latitude = coordinates.get('latitude', record.latitude)
+        record.longitude = coordinates.get('longitude', record.longitude)
     else:
         return jsonify({'error': 'Invalid detection type'}), 400
 
@@ -0,0 +1,10 @@
+from flask import Blueprint, Response
+from api.service.metrics import render
+
+metrics_bp = Blueprint('metrics_bp', __name__)
+
+
+# ---------------- GET: Prometheus metrics (stage histograms, model counters) ----------------
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -1,5 +1,7 @@
 from database import db
 from datetime import datetime
+from api.service.dedup_cache import perceptual_bands
+from api.service.geo import geohash_encode
 
 class Pothole(db.Model):
     __tablename__ = 'potholes'
@@ -9,8 +11,17 @@ class Pothole(db.Model):
     location = db.Column(db.String(255))
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
-    status = db.Column(db.String(100))
+    geohash = db.Column(db.String(12), index=True)  # spatial queries का लागि (before_insert/update मा भरिन्छ)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    status = db.Column(db.String(100), index=True)
+    report_count = db.Column(db.Integer, default=1, nullable=False, server_default='1')  # merge गरिएका रिपोर्ट संख्या
+    last_reported_at = db.Column(db.DateTime, default=datetime.utcnow)
+    content_hash = db.Column(db.String(64), index=True)     # SHA-256, duplicate uploads पत्ता लगाउन
+    perceptual_hash = db.Column(db.String(16), index=True)  # dHash, लगभग उस्तै तस्बिरका लागि
+    # dHash का 2-4 औं bands (पहिलो band perceptual_hash कै prefix index); Hamming lookup का लागि
+    perceptual_band1 = db.Column(db.String(4), index=True)
+    perceptual_band2 = db.Column(db.String(4), index=True)
+    perceptual_band3 = db.Column(db.String(4), index=True)
 
     def to_dict(self):
         return {
@@ -21,7 +32,9 @@ class Pothole(db.Model):
             "latitude": self.latitude,
             "longitude": self.longitude,
             "timestamp": self.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-            "status": self.status
+            "status": self.status,
+            "report_count": self.report_count,
+            "last_reported_at": self.last_reported_at.strftime("%Y-%m-%d %H:%M:%S") if self.last_reported_at else None
         }
 
 class Waste(db.Model):
@@ -32,12 +45,20 @@ class Waste(db.Model):
     location = db.Column(db.String(255))
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
-    detection_status = db.Column(db.String(100))
+    geohash = db.Column(db.String(12), index=True)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    detection_status = db.Column(db.String(100), index=True)
     is_waste = db.Column(db.Boolean, default=False)
-    waste_category = db.Column(db.String(100))
+    waste_category = db.Column(db.String(100), index=True)
     is_recyclable = db.Column(db.Boolean, default=False)
     is_decomposable = db.Column(db.Boolean, default=False)
+    report_count = db.Column(db.Integer, default=1, nullable=False, server_default='1')
+    last_reported_at = db.Column(db.DateTime, default=datetime.utcnow)
+    content_hash = db.Column(db.String(64), index=True)
+    perceptual_hash = db.Column(db.String(16), index=True)
+    perceptual_band1 = db.Column(db.String(4), index=True)
+    perceptual_band2 = db.Column(db.String(4), index=True)
+    perceptual_band3 = db.Column(db.String(4), index=True)
 
     def to_dict(self):
         return {
@@ -52,5 +73,44 @@ class Waste(db.Model):
             "is_waste": self.is_waste,
             "waste_category": self.waste_category,
             "is_recyclable": self.is_recyclable,
-            "is_decomposable": self.is_decomposable
+            "is_decomposable": self.is_decomposable,
+            "report_count": self.report_count,
+            "last_reported_at": self.last_reported_at.strftime("%Y-%m-%d %H:%M:%S") if self.last_reported_at else None
         }
+
+
+class DetectionStat(db.Model):
+    """
+    Dashboard का लागि pre-aggregated counts: (type, dimension, bucket) अनुसार records र
+    reports को संख्या। stats_service ले detections सँगै उही transaction मा अद्यावधिक गर्छ।
+    """
+    __tablename__ = 'detection_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    detection_type = db.Column(db.String(20), nullable=False)
+    dimension = db.Column(db.String(30), nullable=False)
+    bucket = db.Column(db.String(255), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    reports = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('detection_type', 'dimension', 'bucket', name='uq_detection_stats_bucket'),
+    )
+
+
+# Latitude/longitude बदलिँदा geohash सधैं मिलाउने
+@db.event.listens_for(Pothole, 'before_insert')
+@db.event.listens_for(Pothole, 'before_update')
+@db.event.listens_for(Waste, 'before_insert')
+@db.event.listens_for(Waste, 'before_update')
+def _set_geohash(mapper, connection, target):
+    target.geohash = geohash_encode(target.latitude, target.longitude)
+
+
+# Perceptual hash बदलिँदा bands पनि मिलाउने
+@db.event.listens_for(Pothole, 'before_insert')
+@db.event.listens_for(Pothole, 'before_update')
+@db.event.listens_for(Waste, 'before_insert')
+@db.event.listens_for(Waste, 'before_update')
+def _set_perceptual_bands(mapper, connection, target):
+    bands = perceptual_bands(target.perceptual_hash) if target.perceptual_hash else [None] * 4
+    target.perceptual_band1, target.perceptual_band2, target.perceptual_band3 = bands[1:]
@@ -0,0 +1,176 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context
+from api.service.metrics import Counter, Gauge, Histogram
+
+ADMISSION_WAIT_SECONDS = Histogram(
+    'detection_admission_wait_seconds', 'Time requests waited for an inference slot.'
+)
+ADMISSION_REJECTED = Counter(
+    'detection_admission_rejected_total', 'Requests rejected by the inference limiter.', ('reason',)
+)
+
+
+class AdmissionRejected(RuntimeError):
+    """Inference slot समयमै नपाएमा (503 + Retry-After)।"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f'Server busy ({reason}); retry in {retry_after} s')
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Inference concurrency सीमित गर्छ: एकै पटक `max_concurrent` भन्दा बढी predict नचलून्,
+    `max_queue` भन्दा बढी पर्खिन नपाऊन्, र deadline भित्र slot नपाए तुरुन्तै reject। पर्खनेहरू
+    FIFO मा slot पाउँछन् (release ले slot सिधै अर्को waiter लाई हस्तान्तरण गर्छ)।
+    `max_queue` 0/None = असीमित queue; `acquire` को timeout None = deadline छैन।
+    """
+
+    def __init__(self, max_concurrent, max_queue):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue or None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters = deque()
+        # Slot कति बेर ओगटिन्छ (EWMA) — Retry-After अनुमानका लागि
+        self._service_s = None
+        self.counters = {'admitted': 0, 'queue_full': 0, 'deadline': 0}
+
+    def acquire(self, timeout_s=None):
+        """Slot पाउँदा पर्खिएको समय (s) फर्काउँछ; नपाए AdmissionRejected।"""
+        with self._lock:
+            if self._active < self.max_concurrent and not self._waiters:
+                self._active += 1
+                self.counters['admitted'] += 1
+                ADMISSION_WAIT_SECONDS.observe(0.0)
+                return 0.0
+            queue_full = self.max_queue is not None and len(self._waiters) >= self.max_queue
+            expired = timeout_s is not None and timeout_s <= 0
+            if queue_full or expired:
+                reason = 'deadline' if expired else 'queue_full'
+                self.counters[reason] += 1
+                retry_after = self._retry_after()
+            else:
+                waiter = threading.Event()
+                self._waiters.append(waiter)
+                reason = None
+        if reason:
+            ADMISSION_REJECTED.inc(reason=reason)
+            raise AdmissionRejected(reason, retry_after)
+
+        started = time.perf_counter()
+        waiter.wait(timeout_s)
+        waited = time.perf_counter() - started
+        with self._lock:
+            # Timeout र release एकै क्षणमा भए पनि slot हस्तान्तरण भइसकेको छ भने राख्ने
+            if not waiter.is_set():
+                self._waiters.remove(waiter)
+                self.counters['deadline'] += 1
+                retry_after = self._retry_after()
+            else:
+                self.counters['admitted'] += 1
+                retry_after = None
+        ADMISSION_WAIT_SECONDS.observe(waited)
+        if retry_after is not None:
+            ADMISSION_REJECTED.inc(reason='deadline')
+            raise AdmissionRejected('deadline', retry_after)
+        return waited
+
+    def release(self, held_s):
+        with self._lock:
+            self._service_s = held_s if self._service_s is None else 0.8 * self._service_s + 0.2 * held_s
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._active -= 1
+
+    def _retry_after(self):
+        # अगाडिका सबै (active + queue) सकिन लाग्ने अनुमानित समय, कम्तीमा 1 s
+        service_s = self._service_s or 1.0
+        backlog = len(self._waiters) + self._active
+        return max(1, math.ceil(service_s * backlog / self.max_concurrent))
+
+    @contextmanager
+    def slot(self, timeout_s=None):
+        self.acquire(timeout_s)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def queue_depth(self):
+        return len(self._waiters)
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self.counters,
+                'active': self._active,
+                'queue_depth': len(self._waiters),
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'avg_service_ms': round(self._service_s * 1000, 3) if self._service_s is not None else None
+            }
+
+
+_CONTROLLER = None
+_CONTROLLER_LOCK = threading.Lock()
+
+Gauge(
+    'detection_admission_queue_depth', 'Requests currently waiting for an inference slot.',
+    lambda: _CONTROLLER.queue_depth() if _CONTROLLER is not None else None
+)
+Gauge(
+    'detection_admission_active', 'Requests currently holding an inference slot.',
+    lambda: _CONTROLLER.stats()['active'] if _CONTROLLER is not None else None
+)
+
+
+def get_admission_controller():
+    """
+    INFERENCE_MAX_CONCURRENT > 0 भए process भरि एउटै limiter, नत्र None।
+
+    BATCH_INFERENCE सक्रिय हुँदा हरेक मोडलको batcher worker ले predict आफैं क्रमिक चलाउँछ, र
+    requests batcher को future पर्खँदा पनि slot ओगटिरहन्छन्; त्यसैले slots लाई batch भरिन
+    पुग्ने गरी INFERENCE_MAX_CONCURRENT x BATCH_MAX_SIZE राखिन्छ (नत्र batch कहिल्यै
+    INFERENCE_MAX_CONCURRENT भन्दा ठूलो हुँदैन)।
+    """
+    global _CONTROLLER
+    config = current_app.config
+    if _CONTROLLER is None and config.get('INFERENCE_MAX_CONCURRENT', 0) > 0:
+        with _CONTROLLER_LOCK:
+            if _CONTROLLER is None:
+                max_concurrent = config['INFERENCE_MAX_CONCURRENT']
+                if config.get('BATCH_INFERENCE', False):
+                    max_concurrent *= max(1, int(config.get('BATCH_MAX_SIZE', 8)))
+                _CONTROLLER = AdmissionController(max_concurrent, config.get('INFERENCE_MAX_QUEUE', 8))
+    return _CONTROLLER
+
+
+def admission_stats():
+    return _CONTROLLER.stats() if _CONTROLLER is not None else None
+
+
+@contextmanager
+def admit():
+    """
+    Inference अघि slot लिने। Deadline (INFERENCE_DEADLINE_MS) request सुरु भएदेखि गनिन्छ,
+    त्यसैले upload/decode मा लागेको समय पनि budget बाटै घट्छ।
+    """
+    controller = get_admission_controller()
+    if controller is None:
+        yield
+        return
+
+    deadline_ms = current_app.config.get('INFERENCE_DEADLINE_MS', 10000)
+    budget_s = deadline_ms / 1000 if deadline_ms > 0 else None  # 0 = deadline छैन
+    if budget_s is not None and has_request_context() and g.get('request_started') is not None:
+        budget_s -= time.perf_counter() - g.request_started
+    with controller.slot(budget_s):
+        yield
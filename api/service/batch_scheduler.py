@@ -0,0 +1,120 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class _Timing:
+    """गणना, जम्मा र अधिकतम मात्र राख्ने सानो aggregate (milliseconds)।"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self):
+        return {
+            'avg_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max, 3)
+        }
+
+
+class MicroBatcher:
+    """
+    एकै मोडलका लागि आएका frames लाई `max_wait_ms` सम्म वा `max_batch_size` वटा नपुगेसम्म
+    जम्मा गरेर एउटै `predict` call मा चलाउँछ, र प्रत्येक result लाई आफ्नो request
+    (Future) मा फर्काउँछ।
+    """
+
+    def __init__(self, name, predict_fn, max_batch_size=8, max_wait_ms=5):
+        self.name = name
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        # Metrics
+        self._batches = 0
+        self._items = 0
+        self._batch_sizes = {}
+        self._queue_wait = _Timing()
+        self._batch_latency = _Timing()
+
+    def submit(self, frame):
+        """Frame लाई queue मा राखेर Future फर्काउँछ; result batch चलेपछि मिल्छ।"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((frame, future, time.perf_counter()))
+        return future
+
+    def predict(self, frame):
+        return self.submit(frame).result()
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=f'batcher-{self.name}', daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                results = self.predict_fn([frame for frame, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._batch_sizes[len(batch)] = self._batch_sizes.get(len(batch), 0) + 1
+                self._batch_latency.add((finished - started) * 1000)
+                for _, _, enqueued in batch:
+                    self._queue_wait.add((started - enqueued) * 1000)
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+                'batches': self._batches,
+                'images': self._items,
+                'avg_batch_size': round(self._items / self._batches, 3) if self._batches else 0.0,
+                'batch_size_counts': dict(sorted(self._batch_sizes.items())),
+                'queue_depth': self._queue.qsize(),
+                'queue_wait': self._queue_wait.to_dict(),
+                'batch_latency': self._batch_latency.to_dict()
+            }
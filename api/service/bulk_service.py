@@ -0,0 +1,242 @@
+import csv
+import io
+import json
+import os
+import tarfile
+import zipfile
+from database import db
+from api.service.admission import AdmissionRejected
+from api.service.detection_service import classify_frames, decode_image, save_detection_images
+from api.service.ingest_service import (
+    CREATED, DUPLICATE, MERGED, NO_DETECTION, NOT_DETECTED, find_duplicate, remember
+)
+from api.service.merge_service import find_open_detection, find_pending_match, merge_report
+from api.service.record_service import build_detection_record
+
+MANIFEST_NAMES = ('manifest.csv', 'manifest.json')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+DEFAULT_CHUNK_SIZE = 16
+ERROR = 'error'
+
+
+def parse_manifest(data, name):
+    """
+    CSV (filename,latitude,longitude,location) वा JSON (objects को list, वा
+    filename -> object) manifest लाई {filename: {...}} मा बदल्छ।
+    """
+    text = data.decode('utf-8-sig') if isinstance(data, bytes) else data
+    if name.lower().endswith('.json'):
+        entries = json.loads(text)
+        if isinstance(entries, dict):
+            entries = [{'filename': key, **value} for key, value in entries.items()]
+    else:
+        entries = list(csv.DictReader(io.StringIO(text)))
+
+    manifest = {}
+    for entry in entries:
+        filename = (entry.get('filename') or '').strip()
+        if filename:
+            manifest[filename] = entry
+    return manifest
+
+
+def _lookup(manifest, name):
+    # Archive भित्र folder भए पनि पूरा पथ वा basename दुवैले मिलाउने
+    return manifest.get(name) or manifest.get(os.path.basename(name))
+
+
+def iter_archive(fileobj, manifest=None):
+    """
+    ZIP वा tar archive बाट (name, bytes, metadata) एक-एक गरी निकाल्छ। पूरै archive
+    memory मा लोड हुँदैन; एक पटकमा एउटा member मात्र पढिन्छ। Manifest archive भित्र
+    (manifest.csv / manifest.json) वा छुट्टै दिन सकिन्छ।
+    """
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as archive:
+            members = [info for info in archive.infolist() if not info.is_dir()]
+            if manifest is None:
+                manifest_info = next((m for m in members if os.path.basename(m.filename) in MANIFEST_NAMES), None)
+                if manifest_info is None:
+                    raise ValueError('Archive has no manifest.csv or manifest.json')
+                manifest = parse_manifest(archive.read(manifest_info), manifest_info.filename)
+            for info in members:
+                if info.filename.lower().endswith(IMAGE_EXTENSIONS):
+                    yield info.filename, archive.read(info), _lookup(manifest, info.filename)
+        return
+
+    fileobj.seek(0)
+    try:
+        archive = tarfile.open(fileobj=fileobj, mode='r:*')
+    except tarfile.TarError:
+        raise ValueError('Archive must be a ZIP or tar file')
+    with archive:
+        if manifest is None:
+            manifest_info = next((m for m in archive if os.path.basename(m.name) in MANIFEST_NAMES), None)
+            if manifest_info is None:
+                raise ValueError('Archive has no manifest.csv or manifest.json')
+            manifest = parse_manifest(archive.extractfile(manifest_info).read(), manifest_info.name)
+        for info in archive:
+            if info.isfile() and info.name.lower().endswith(IMAGE_EXTENSIONS):
+                yield info.name, archive.extractfile(info).read(), _lookup(manifest, info.name)
+
+
+def iter_directory(folder, manifest=None):
+    """CLI का लागि: folder भित्रका तस्बिरहरू (manifest नदिए folder को manifest.csv/json)।"""
+    if manifest is None:
+        for name in MANIFEST_NAMES:
+            path = os.path.join(folder, name)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    manifest = parse_manifest(f.read(), name)
+                break
+        else:
+            raise ValueError(f'{folder} has no manifest.csv or manifest.json')
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            with open(os.path.join(folder, name), 'rb') as f:
+                yield name, f.read(), _lookup(manifest, name)
+
+
+def iter_uploads(files, manifest):
+    """Multipart batch: धेरै `images` files र एउटा manifest।"""
+    for image in files:
+        yield image.filename, image.read(), _lookup(manifest, image.filename)
+
+
+def _item(name, status, detection_type=None, record=None, error=None):
+    item = {'filename': name, 'status': status}
+    if detection_type:
+        item['detection_type'] = detection_type
+    if record is not None:
+        item['id'] = record.id
+    if error:
+        item['error'] = error
+    return item
+
+
+def _parse_location(metadata):
+    if metadata is None:
+        raise ValueError('No manifest entry for this file')
+    try:
+        latitude, longitude = float(metadata['latitude']), float(metadata['longitude'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('Latitude and Longitude must be valid numbers')
+    location = metadata.get('location')
+    if not location:
+        raise ValueError('Missing location')
+    return location, latitude, longitude
+
+
+def _process_chunk(chunk):
+    """
+    एउटा chunk: decode + duplicate जाँच, बाँकीमा एउटै batched inference, त्यसपछि
+    सबै नयाँ rows एउटै transaction मा insert।
+    """
+    items, pending = [], []
+    for name, data, metadata in chunk:
+        try:
+            location, latitude, longitude = _parse_location(metadata)
+            frame = decode_image(data)
+        except ValueError as e:
+            items.append(_item(name, ERROR, error=str(e)))
+            continue
+
+        match, hashes = find_duplicate(data, frame)
+        if match == NO_DETECTION:
+            items.append(_item(name, DUPLICATE))
+        elif match is not None:
+            items.append(_item(name, DUPLICATE, match[0], match[1]))
+        else:
+            item = _item(name, NOT_DETECTED)
+            items.append(item)
+            pending.append((item, name, data, frame, hashes, location, latitude, longitude))
+
+    classified = classify_frames([entry[3] for entry in pending])
+    created = []
+    # नयाँ rows अन्त्यमा एकैचोटि insert गर्न autoflush बन्द (एक-एक INSERT नहोस्)
+    with db.session.no_autoflush:
+        for (item, name, data, _, hashes, location, latitude, longitude), (detection_type, result, result_data) in zip(pending, classified):
+            if not detection_type:
+                remember(hashes, None, None)
+                continue
+            item['detection_type'] = detection_type
+
+            # उही chunk मा भर्खर बनेको record
+            pending_match = find_pending_match(
+                [(entry[2], entry[3]) for entry in created], detection_type, result_data, latitude, longitude
+            )
+            if pending_match is not None:
+                pending_match.report_count += 1
+                item['status'] = MERGED
+                created.append((item, hashes, detection_type, pending_match))
+                continue
+
+            existing = find_open_detection(detection_type, result_data, latitude, longitude)
+            if existing is not None:
+                merge_report(existing, commit=False)
+                item['status'], item['id'] = MERGED, existing.id
+                remember(hashes, detection_type, existing)
+                continue
+
+            result_data['image_name'], result_data['detected_image_path'] = save_detection_images(
+                detection_type, os.path.basename(name), data, result
+            )
+            result_data.update(hashes)
+            record = build_detection_record(detection_type, result_data, location, latitude, longitude)
+            record.report_count = 1
+            item['status'] = CREATED
+            created.append((item, hashes, detection_type, record))
+
+    # एउटा transaction: SQLAlchemy ले नयाँ rows multi-row INSERT (insertmanyvalues) मा पठाउँछ
+    db.session.add_all({id(record): record for _, _, _, record in created}.values())
+    db.session.commit()
+    for item, hashes, detection_type, record in created:
+        item['id'] = record.id
+        remember(hashes, detection_type, record)
+    return items
+
+
+def _process_chunk_safely(chunk):
+    """
+    Chunk असफल भए (overload, model load, DB error) त्यसको transaction rollback गरेर
+    chunk का सबै items `error` मा; अघिल्ला chunks commit भइसकेका हुन्छन्।
+    """
+    try:
+        return _process_chunk(chunk)
+    except AdmissionRejected as e:
+        db.session.rollback()
+        # Overload: यी files पछि फेरि पठाउन सकिन्छ (dedup ले सफल भइसकेकालाई दोहोर्‍याउँदैन)
+        return [{**_item(name, ERROR, error=str(e)), 'retry_after': e.retry_after} for name, _, _ in chunk]
+    except Exception as e:
+        db.session.rollback()
+        print(f'Bulk chunk of {len(chunk)} images failed: {e}')
+        return [_item(name, ERROR, error=str(e)) for name, _, _ in chunk]
+
+
+def ingest_entries(entries, chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    """
+    (name, bytes, metadata) entries लाई `chunk_size` को chunk मा प्रशोधन गर्छ। प्रति chunk
+    एउटा batched inference र एउटा commit। ({status: count}, items) फर्काउँछ।
+
+    पूरै ingest atomic होइन: हरेक chunk आफ्नै transaction हो। कुनै chunk असफल भए त्यसका
+    items `error` (overload भए `retry_after` सहित) हुन्छन् र बाँकी chunks चलिरहन्छन्, त्यसैले
+    items ले कुन persist भयो भन्ने सधैं देखाउँछ।
+    """
+    items, chunk = [], []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) >= chunk_size:
+            items.extend(_process_chunk_safely(chunk))
+            chunk = []
+            if on_chunk:
+                on_chunk(items)
+    if chunk:
+        items.extend(_process_chunk_safely(chunk))
+        if on_chunk:
+            on_chunk(items)
+
+    summary = {}
+    for item in items:
+        summary[item['status']] = summary.get(item['status'], 0) + 1
+    return summary, items
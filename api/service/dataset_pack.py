@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import shutil
+import cv2
+import numpy as np
+from api.service.inference_engine import letterbox
+from api.service.model_export import dataset_images, label_path, load_labels
+from api.service.model_registry import MODEL_SPECS, PROJECT_DIR
+
+# `flask detections pack-datasets` ले बनाउने: packed/<model>/<split>/{images,labels,label_index}.npy + meta.json
+PACKED_ROOT = os.path.join(PROJECT_DIR, 'packed')
+SPLITS = ('train', 'valid', 'test')
+FORMAT_VERSION = 1
+
+
+def packed_dir(name, split, root=None):
+    return os.path.join(root or PACKED_ROOT, name, split)
+
+
+def source_fingerprint(paths):
+    """Source तस्बिर र label फाइलहरूको (path, size, mtime) बाट SHA-1: dataset बदलिएको थाहा पाउन।"""
+    digest = hashlib.sha1()
+    for path in paths:
+        for source in (path, label_path(path)):
+            try:
+                stat = os.stat(source)
+                digest.update(f'{os.path.relpath(source, PROJECT_DIR)}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode())
+            except FileNotFoundError:
+                digest.update(f'{os.path.relpath(source, PROJECT_DIR)}:missing\n'.encode())
+    return digest.hexdigest()
+
+
+def pack_split(name, split='test', root=None, limit=None, force=False):
+    """
+    `name` dataset को `split` लाई मोडलको imgsz मा letterbox गरेर एउटै uint8 array
+    (N, imgsz, imgsz, 3, BGR) मा लेख्छ, र labels लाई letterboxed canvas को normalized
+    xyxy मा packed array बनाउँछ। Source नबदलिएको भए (fingerprint उही) फेरि बनाउँदैन।
+    meta dict फर्काउँछ; तस्बिर नै नभए None।
+    """
+    paths = dataset_images(name, split, limit)
+    if not paths:
+        return None
+
+    target = packed_dir(name, split, root)
+    fingerprint = source_fingerprint(paths)
+    meta_path = os.path.join(target, 'meta.json')
+    if not force and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('fingerprint') == fingerprint and meta.get('version') == FORMAT_VERSION:
+            meta['skipped'] = True
+            return meta
+
+    imgsz = MODEL_SPECS[name]['imgsz']
+    # पूरा लेखिसकेपछि मात्र rename: अधुरो pack कहिल्यै loader ले नपढोस्
+    tmp = target + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    images = np.lib.format.open_memmap(
+        os.path.join(tmp, 'images.npy'), mode='w+', dtype=np.uint8, shape=(len(paths), imgsz, imgsz, 3)
+    )
+
+    labels, label_index = [], [0]
+    sources, shapes, transforms = [], [], []
+    for path in paths:
+        frame = cv2.imread(path)
+        if frame is None:
+            print(f'Skipping unreadable image {path}')
+            continue
+        height, width = frame.shape[:2]
+        image, ratio, (pad_x, pad_y) = letterbox(frame, imgsz)
+        images[len(sources)] = image
+
+        # Original normalized xyxy -> letterboxed canvas normalized xyxy
+        xyxy, classes = load_labels(path)
+        scale = np.array([width, height, width, height], dtype=np.float32) * ratio
+        offset = np.array([pad_x, pad_y, pad_x, pad_y], dtype=np.float32)
+        boxed = (xyxy * scale + offset) / imgsz
+        labels.append(np.column_stack([classes.astype(np.float32), boxed]))
+        label_index.append(label_index[-1] + len(classes))
+
+        sources.append(os.path.relpath(path, PROJECT_DIR))
+        shapes.append([height, width])
+        transforms.append([ratio, pad_x, pad_y])
+
+    images.flush()
+    del images
+    count = len(sources)
+
+    # labels: (M, 5) [cls, x1, y1, x2, y2]; तस्बिर i का labels label_index[i]:label_index[i + 1]
+    np.save(os.path.join(tmp, 'labels.npy'), np.concatenate(labels).astype(np.float32) if labels else np.zeros((0, 5), np.float32))
+    np.save(os.path.join(tmp, 'label_index.npy'), np.asarray(label_index, dtype=np.int64))
+    meta = {
+        'version': FORMAT_VERSION,
+        'model': name,
+        'split': split,
+        'imgsz': imgsz,
+        'count': count,
+        'labels': label_index[-1],
+        'fingerprint': fingerprint,
+        'sources': sources,
+        'shapes': shapes,         # मूल (height, width)
+        'transforms': transforms  # letterbox (ratio, pad_x, pad_y)
+    }
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+    return meta
+
+
+class PackedDataset:
+    """
+    `pack_split` ले बनाएको split को read-only loader। Images memory-mapped हुन्छन्, त्यसैले
+    खोल्न सस्तो छ र पढिएका pages मात्र memory मा आउँछन् (धेरै processes ले OS page cache बाँड्छन्)।
+    """
+
+    def __init__(self, name, split='test', root=None):
+        self.path = packed_dir(name, split, root)
+        meta_path = os.path.join(self.path, 'meta.json')
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(
+                f'No packed {name}/{split} dataset at {self.path}; run `flask detections pack-datasets` first'
+            )
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        self.name = name
+        self.split = split
+        self.imgsz = self.meta['imgsz']
+        # Unreadable source भएर skip भएका तस्बिरका खाली slots अन्त्यमा हुन्छन्
+        self.images = np.load(os.path.join(self.path, 'images.npy'), mmap_mode='r')[:self.meta['count']]
+        self.labels = np.load(os.path.join(self.path, 'labels.npy'))
+        self.label_index = np.load(os.path.join(self.path, 'label_index.npy'))
+
+    def __len__(self):
+        return self.meta['count']
+
+    def __getitem__(self, index):
+        """(letterboxed BGR image (imgsz, imgsz, 3), gt xyxy normalized (K, 4), gt cls (K,))।"""
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        rows = self.labels[self.label_index[index]:self.label_index[index + 1]]
+        return self.images[index], rows[:, 1:], rows[:, 0].astype(int)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def batches(self, batch_size=16):
+        """लगातारका तस्बिरहरूको (images (B, imgsz, imgsz, 3) view, [(xyxy, cls), ...]) batches।"""
+        for start in range(0, len(self), batch_size):
+            stop = min(start + batch_size, len(self))
+            yield self.images[start:stop], [self[i][1:] for i in range(start, stop)]
+
+    def is_stale(self):
+        """Source dataset pack गरेपछि बदलिएको भए True।"""
+        paths = [os.path.join(PROJECT_DIR, source) for source in self.meta['sources']]
+        return source_fingerprint(paths) != self.meta['fingerprint']
@@ -0,0 +1,146 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+# केही पत्ता नलागेका uploads पनि memory मा सम्झने (DB मा row हुँदैन)
+NO_DETECTION = ('none', None)
+
+# 64-bit dHash लाई 4 वटा 16-bit (4 hex) bands मा: Hamming distance <= 3 भएका दुई hash को
+# कम्तीमा एउटा band ठ्याक्कै मिल्छ (pigeonhole), त्यसैले band lookup पछि popcount जाँच पुग्छ
+PERCEPTUAL_BANDS = 4
+PERCEPTUAL_PREFIX = 'p:'
+
+
+def content_hash(data):
+    """Upload गरिएको raw bytes को SHA-256 (hex)।"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def perceptual_hash(frame):
+    """
+    64-bit difference hash (dHash): resize/re-encode गरिएका लगभग उस्तै तस्बिरको
+    hash पनि उही आउँछ। 16 अक्षरको hex फर्काउँछ; लगभग एकै रङको (structure नभएको)
+    तस्बिरका लागि None, किनकि त्यस्ता सबै तस्बिरको hash एउटै हुन्छ।
+    """
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    if bits.sum() in (0, bits.size):
+        return None
+    return f'{int(np.packbits(bits).view(">u8")[0]):016x}'
+
+
+def perceptual_bands(phash):
+    """16 अक्षरको hex hash का PERCEPTUAL_BANDS वटा बराबर टुक्रा।"""
+    width = len(phash) // PERCEPTUAL_BANDS
+    return [phash[i * width:(i + 1) * width] for i in range(PERCEPTUAL_BANDS)]
+
+
+def hamming_distance(a, b):
+    """दुई hex hash बीच फरक bits को संख्या।"""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+class DetectionCache:
+    """
+    Hash -> (detection_type, record_id) को bounded LRU। DB मा रहेको hash column
+    यसको पछाडिको स्थायी index हो; यो cache ले बारम्बार आउने uploads मा DB query पनि बचाउँछ।
+    Perceptual keys (`p:<dHash>`) को band index पनि राखिन्छ, ताकि `similar` ले नजिकको hash भेटोस्।
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._bands = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            'memory_hits': 0,
+            'db_hits': 0,
+            'perceptual_hits': 0,
+            'misses': 0
+        }
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if key not in self._entries:
+                self._index(key, add=True)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted, _ = self._entries.popitem(last=False)
+                self._index(evicted, add=False)
+
+    def discard(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._index(key, add=False)
+
+    def _index(self, key, add):
+        if not key.startswith(PERCEPTUAL_PREFIX):
+            return
+        phash = key[len(PERCEPTUAL_PREFIX):]
+        for band in enumerate(perceptual_bands(phash)):
+            if add:
+                self._bands.setdefault(band, set()).add(phash)
+            else:
+                hashes = self._bands.get(band)
+                if hashes is not None:
+                    hashes.discard(phash)
+                    if not hashes:
+                        del self._bands[band]
+
+    def similar(self, phash, max_distance):
+        """
+        Cache मा `max_distance` bits भित्रको सबैभन्दा नजिकको perceptual key (नभए None)।
+        """
+        with self._lock:
+            candidates = set()
+            for band in enumerate(perceptual_bands(phash)):
+                candidates |= self._bands.get(band, set())
+        best = None
+        for candidate in candidates:
+            distance = hamming_distance(phash, candidate)
+            if distance <= max_distance and (best is None or distance < best[0]):
+                best = (distance, candidate)
+        return PERCEPTUAL_PREFIX + best[1] if best else None
+
+    def count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def stats(self):
+        with self._lock:
+            hits = self.counters['memory_hits'] + self.counters['db_hits'] + self.counters['perceptual_hits']
+            total = hits + self.counters['misses']
+            return {
+                **self.counters,
+                'hit_ratio': round(hits / total, 4) if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache(maxsize=10000):
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = DetectionCache(maxsize)
+    return _CACHE
+
+
+def dedup_stats():
+    return _CACHE.stats() if _CACHE is not None else None
@@ -1,100 +1,134 @@
 import os
 import time
+import cv2
+import numpy as np
 from flask import current_app
-from ultralytics import YOLO
+from api.service.admission import admit
+from api.service.image_service import generate_variants
+from api.service.inference_engine import run_detection, run_detection_batch
+from api.service.metrics import span
+from api.service.model_registry import get_model, record_first_request
+from api.service.storage import content_key, get_storage
+from api.service.tiled_inference import TILING_DEFAULTS, tiling_params
 
-# Base directory
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Models import गर्दा load हुँदैनन्; पहिलो प्रयोगमा model_registry ले lazy load गर्छ
 
-# Models
-POTHOLE_MODEL_PATH = os.path.join(BASE_DIR, '..', 'models', 'best.pt')
-WASTE_MODEL_PATH = os.path.join(BASE_DIR, '..', 'models', 'waste.pt')
+# NOTE: तपाईंको मोडलको आधारमा CLASS_MAP इन्डेक्सहरू जाँच गर्नुहोस्
+CLASS_MAP = {0: 'Glass', 1: 'Metal', 2: 'Paper', 3: 'Plastic', 4: 'Residual'}
 
-# Load models
-try:
-    POTHOLE_MODEL = YOLO(POTHOLE_MODEL_PATH)
-    WASTE_MODEL = YOLO(WASTE_MODEL_PATH)
-except Exception as e:
-    print(f"Error loading models: {e}. Check your model paths.")
-    POTHOLE_MODEL = None
-    WASTE_MODEL = None
 
+def decode_image(data):
+    """
+    Upload गरिएको raw bytes लाई एक पटक मात्र BGR NumPy array मा decode गर्छ।
+    """
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError('Uploaded file is not a valid image')
+    return frame
+
+
+def save_detection_images(detection_type, filename_base, data, result):
+    """
+    मूल bytes र annotated तस्बिरलाई storage backend मा content-hash key सहित लेख्छ, साथै
+    list/map views का लागि thumbnail/WebP variants पनि। DB मा राखिने relative keys
+    (original_key, detected_key) फर्काउँछ।
+    """
+    storage = get_storage()
+    ext = os.path.splitext(filename_base or '')[1] or '.jpg'
+
+    # मूल upload bytes जस्ताको तस्तै लेख्ने (re-encode नगरी)
+    with span('storage_write'):
+        original_key = storage.save(content_key(f'{detection_type}/original', data, ext), data)
+
+    # Annotated तस्बिर एक पटक plot गरेर (result.save जस्तै) encode; variants पनि यही array बाट
+    # (engine ले result लाई मूल full-res frame मा फर्काउँछ, त्यसैले plot पनि पूरा resolution मा)
+    with span('annotate'):
+        annotated = result.plot()
+        ok, encoded = cv2.imencode('.jpg', annotated)
+    if not ok:
+        raise ValueError('Could not encode detected image')
+    encoded = encoded.tobytes()
+    with span('storage_write'):
+        detected_key = storage.save(content_key(f'{detection_type}/detected', encoded, '.jpg'), encoded)
+    with span('variants'):
+        generate_variants(detected_key, frame=annotated)
+
+    return original_key, detected_key
+
+
+def _batching_config():
+    if not current_app.config.get('BATCH_INFERENCE', False):
+        return None
+    return {
+        'max_batch_size': current_app.config.get('BATCH_MAX_SIZE', 8),
+        'max_wait_ms': current_app.config.get('BATCH_MAX_WAIT_MS', 5)
+    }
 
-def detect_image_type(image):
+
+def _tiling_config():
+    if not current_app.config.get('TILED_INFERENCE', False):
+        return None
+    overrides = current_app.config.get('TILING_PARAMS', {})
+    return {name: tiling_params(name, overrides) for name in TILING_DEFAULTS}
+
+
+def classify_frame(frame):
     """
-    पहिले पोटहोल पत्ता लगाउँछ, त्यसपछि फोहोर। अस्थायी रूपमा फाइलहरू बचत गर्छ।
+    पोटहोल र फोहोर दुवै मोडल एकै पटक चलाउँछ (पोटहोललाई प्राथमिकता)।
+    (detection_type, result, result_data) फर्काउँछ; फाइलहरू यहाँ लेखिँदैनन्।
     """
-    if not POTHOLE_MODEL or not WASTE_MODEL:
-        return None, None
+    # Overload मा inference slot समयमै नपाए AdmissionRejected (503) उठ्छ
+    with admit():
+        started = time.perf_counter()
 
-    UPLOAD_FOLDER = current_app.config['UPLOAD_FOLDER']
-    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+        # दुवै मोडल साझा frame मा एकै पटक चल्छन्; pothole-first नियम engine ले लागू गर्छ
+        # (मोडल load हुन नसके ModelLoadError उठ्छ)
+        detection_type, result = run_detection(
+            frame, get_model('pothole'), get_model('waste'),
+            concurrent=current_app.config.get('CONCURRENT_INFERENCE', True),
+            batching=_batching_config(),
+            tiling=_tiling_config()
+        )
+        record_first_request((time.perf_counter() - started) * 1000)
 
-    # अद्वितीय अस्थायी फाइलनामहरू उत्पन्न गर्ने
-    timestamp = int(time.time())
-    original_filename_base = image.filename # मूल अपलोडको नाम
-    temp_original_filename = f"{timestamp}_original_{original_filename_base}"
-    temp_detected_filename = f"{timestamp}_detected_{original_filename_base}"
+    # --- No detection found ---
+    if not detection_type:
+        return None, None, None
+    return detection_type, result, describe_detection(detection_type, result)
 
-    temp_original_path = os.path.join(UPLOAD_FOLDER, temp_original_filename)
-    
-    # 1. मूल तस्बिरलाई अस्थायी पथमा बचत गर्ने (image stream पढ्ने)
-    image.save(temp_original_path) 
-    
-    detection_found = False
 
+def classify_frames(frames):
+    """
+    Bulk ingestion का लागि धेरै frames एकै batch मा: प्रत्येकको (detection_type, result, result_data)।
+    """
+    with admit():
+        outcomes = run_detection_batch(frames, get_model('pothole'), get_model('waste'), tiling=_tiling_config())
+
+    classified = []
+    for detection_type, result in outcomes:
+        if detection_type:
+            classified.append((detection_type, result, describe_detection(detection_type, result)))
+        else:
+            classified.append((None, None, None))
+    return classified
+
+
+def describe_detection(detection_type, result):
+    """Model result बाट DB record का fields (status, category आदि) बनाउँछ।"""
     # ---------- Pothole Detection (उच्च प्राथमिकता) ----------
-    pothole_results = POTHOLE_MODEL.predict(
-        source=temp_original_path,
-        save=False,
-        conf=0.5 # आत्मविश्वासको सीमा (Confidence Threshold)
-    )
-
-    if len(pothole_results[0].boxes) > 0:
-        detection_found = True
-        
-        # पत्ता लागेको तस्बिरलाई अस्थायी नामको साथ बचत गर्ने
-        temp_detected_path = os.path.join(UPLOAD_FOLDER, temp_detected_filename)
-        pothole_results[0].save(filename=temp_detected_path)
-
-        return 'pothole', {
-            'image_name': temp_original_filename,
-            'detected_image_path': temp_detected_filename, # Controller ले यसलाई सार्छ
+    if detection_type == 'pothole':
+        return {
             'status': 'Pothole detected'
         }
 
     # ---------- Waste Detection (पोटहोल पत्ता नलागे मात्र) ----------
-    waste_results = WASTE_MODEL.predict(
-        source=temp_original_path,
-        save=False,
-        conf=0.5 # आत्मविश्वासको सीमा (Confidence Threshold)
-    )
-
-    if len(waste_results[0].boxes) > 0:
-        detection_found = True
-        first_class = int(waste_results[0].boxes.cls[0].item())
-        
-        # NOTE: तपाईंको मोडलको आधारमा CLASS_MAP इन्डेक्सहरू जाँच गर्नुहोस्
-        CLASS_MAP = {0: 'Glass', 1: 'Metal', 2: 'Paper', 3: 'Plastic', 4: 'Residual'}
-        category = CLASS_MAP.get(first_class, 'Unknown')
-        
-        # पत्ता लागेको तस्बिरलाई अस्थायी नामको साथ बचत गर्ने
-        temp_detected_path = os.path.join(UPLOAD_FOLDER, temp_detected_filename)
-        waste_results[0].save(filename=temp_detected_path)
-
-        return 'waste', {
-            'image_name': temp_original_filename,
-            'detected_image_path': temp_detected_filename, # Controller ले यसलाई सार्छ
-            'detection_status': f'{category} detected',
-            'is_waste': True,
-            'waste_category': category,
-            'is_recyclable': category not in ['Residual'], # पेपरलाई decomposable/waste मान्दा
-            'is_decomposable': category == 'Paper' # 'paper' लाई decomposable मानिएको छ
-        }
-    
-    # यदि कुनै पत्ता लागेन भने, अस्थायी रूपमा बचत गरिएको मूल फाइल मेटाउने
-    if not detection_found and os.path.exists(temp_original_path):
-        os.remove(temp_original_path)
+    first_class = int(result.boxes.cls[0].item())
+    category = CLASS_MAP.get(first_class, 'Unknown')
 
-    # --- No detection found ---
-    return None, None
\ No newline at end of file
+    return {
+        'detection_status': f'{category} detected',
+        'is_waste': True,
+        'waste_category': category,
+        'is_recyclable': category not in ['Residual'], # पेपरलाई decomposable/waste मान्दा
+        'is_decomposable': category == 'Paper' # 'paper' लाई decomposable मानिएको छ
+    }
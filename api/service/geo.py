@@ -0,0 +1,84 @@
+import math
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_M = 6371008.8
+# Index मा राखिने geohash को precision (~4.8 m x 4.8 m cells)
+GEOHASH_PRECISION = 9
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Latitude/longitude लाई geohash string मा बदल्छ (None भए None)।"""
+    if latitude is None or longitude is None:
+        return None
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """`precision` को geohash cell को (उचाइ, चौडाइ) degrees मा।"""
+    lat_bits = 5 * precision // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def _steps(start, stop, step):
+    value = start
+    while value < stop:
+        yield value
+        value += step
+    yield stop
+
+
+def covering_cells(min_lat, min_lon, max_lat, max_lon, max_cells=32):
+    """
+    Bounding box लाई ढाक्ने geohash prefixes: `max_cells` भित्र अटाउने सबैभन्दा
+    सानो cell size छानिन्छ। प्रत्येक prefix B-tree index मा एउटा range scan हो।
+    """
+    min_lat, max_lat = max(-90.0, min_lat), min(90.0, max_lat)
+    min_lon, max_lon = max(-180.0, min_lon), min(180.0, max_lon)
+
+    cells = {''}
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size(precision)
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        cols = math.floor(max_lon / width) - math.floor(min_lon / width) + 1
+        if rows * cols > max_cells:
+            break
+        cells = {
+            geohash_encode(lat, lon, precision)
+            for lat in _steps(min_lat, max_lat, height)
+            for lon in _steps(min_lon, max_lon, width)
+        }
+    return sorted(cells)
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """दुई बिन्दुबीचको दूरी metres मा।"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bbox_around(latitude, longitude, radius_m):
+    """बिन्दु वरिपरि `radius_m` ढाक्ने (min_lat, min_lon, max_lat, max_lon)।"""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    dlon = min(180.0, math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat)))
+    return latitude - dlat, longitude - dlon, latitude + dlat, longitude + dlon
@@ -0,0 +1,220 @@
+import os
+import threading
+import cv2
+from flask import current_app
+from api.service.storage import StorageError, get_storage
+
+# Serve गर्न मिल्ने रूपहरू: size (full/thumb) x format (jpeg/webp)
+SIZES = ('full', 'thumb')
+FORMATS = {'jpeg': ('.jpg', 'image/jpeg'), 'webp': ('.webp', 'image/webp')}
+KINDS = ('detected', 'original')
+
+# Upload हुँदा नै बनाइने variants (list/map views ले यिनै माग्छन्)
+ON_WRITE_VARIANTS = (('thumb', 'jpeg'), ('thumb', 'webp'), ('full', 'webp'))
+
+
+class VariantCache:
+    """
+    Thumbnail/WebP variants राख्ने bounded on-disk cache। Hit हुँदा mtime touch गरिन्छ र
+    सीमा नाघे सबैभन्दा पुरानो mtime भएका फाइलहरू पहिले मेटिन्छन् (LRU)। धेरै processes ले
+    एउटै folder बाँड्न सक्ने भएकाले eviction बेला disk नै पुनः scan गरिन्छ।
+    """
+
+    def __init__(self, folder, max_bytes):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+        self.counters = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    def path(self, key):
+        return os.path.join(self.folder, key)
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return path
+
+    def put(self, key, data):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # आधा लेखिएको फाइल कहिल्यै serve नहोस् भनेर tmp मा लेखेर rename
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.counters['writes'] += 1
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+        return path
+
+    def evict(self):
+        """सीमाको ९०% सम्म नझरेसम्म पुराना variants मेटाउँछ।"""
+        with self._lock:
+            entries = []
+            for root, _, files in os.walk(self.folder):
+                for name in files:
+                    try:
+                        st = os.stat(os.path.join(root, name))
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, os.path.join(root, name)))
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.counters['evictions'] += 1
+            self._size = total
+
+    def _scan_size(self):
+        total = 0
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except FileNotFoundError:
+                    pass
+        return total
+
+    def _count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self.counters, 'size_bytes': self._size, 'max_bytes': self.max_bytes}
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_variant_cache():
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = VariantCache(
+                    current_app.config['VARIANT_FOLDER'],
+                    current_app.config.get('VARIANT_CACHE_MAX_MB', 512) * 1024 * 1024
+                )
+    return _CACHE
+
+
+def variant_stats():
+    return _CACHE.stats() if _CACHE is not None else None
+
+
+def source_key(record, kind='detected'):
+    """DB record बाट मूल (original) वा annotated (detected) तस्बिरको storage key।"""
+    return record.detected_image_path if kind == 'detected' else record.image_name
+
+
+def _source_file(key):
+    """
+    Key को local फाइल path: local backend भए सिधै, remote (S3) भए यही node को cache मा
+    एक पटक download गरेर। नभेटिए None।
+    """
+    storage = get_storage()
+    path = storage.local_path(key)
+    if path is not None:
+        return path if os.path.isfile(path) else None
+
+    cache = get_variant_cache()
+    cache_key = os.path.join('source', key)
+    path = cache.get(cache_key)
+    if path is None:
+        try:
+            data = storage.read(key)
+        except StorageError as e:
+            print(f"Could not fetch {key}: {e}")
+            return None
+        if data is None:
+            return None
+        path = cache.put(cache_key, data)
+    return path
+
+
+def variant_key(key, size, fmt):
+    """Variant को cache key: source key कै (sharded) संरचना, size अनुसार छुट्टै।"""
+    return os.path.join(size, os.path.splitext(key)[0] + FORMATS[fmt][0])
+
+
+def render_variant(frame, size, fmt):
+    """BGR frame लाई चाहिएको size/format मा encode गर्छ।"""
+    if size == 'thumb':
+        max_edge = current_app.config.get('IMAGE_THUMB_SIZE', 320)
+        height, width = frame.shape[:2]
+        scale = max_edge / max(height, width)
+        if scale < 1:
+            frame = cv2.resize(frame, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+
+    quality = current_app.config.get('IMAGE_QUALITY', 80)
+    if fmt == 'webp':
+        params = [cv2.IMWRITE_WEBP_QUALITY, quality]
+    else:
+        params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    ok, encoded = cv2.imencode(FORMATS[fmt][0], frame, params)
+    if not ok:
+        raise ValueError(f'Could not encode {fmt} variant')
+    return encoded.tobytes()
+
+
+def generate_variants(key, variants=ON_WRITE_VARIANTS, frame=None):
+    """
+    Upload बेला नै thumbnail र WebP variants cache मा लेख्छ। Variants अनुकूलन मात्र हुन्,
+    त्यसैले असफल भए detection रोकिँदैन (पछि माग्दा lazy रूपमा फेरि बन्छन्)।
+    """
+    try:
+        if frame is None:
+            source = _source_file(key)
+            frame = cv2.imread(source, cv2.IMREAD_COLOR) if source else None
+        if frame is None:
+            return
+        cache = get_variant_cache()
+        for size, fmt in variants:
+            cache.put(variant_key(key, size, fmt), render_variant(frame, size, fmt))
+    except Exception as e:
+        print(f"Variant generation failed for {key}: {e}")
+
+
+def resolve_image(record, kind='detected', size='full', fmt='jpeg'):
+    """
+    Serve गर्ने local फाइलको (path, mimetype) फर्काउँछ। Full-size JPEG भने source नै हो; अरू
+    variants cache बाट, नभए (evict भएका) त्यहीँ बनाएर। फाइल नै नभए None।
+    """
+    key = source_key(record, kind)
+    if not key:
+        return None
+    if size == 'full' and fmt == 'jpeg' and os.path.splitext(key)[1].lower() in ('.jpg', '.jpeg'):
+        source = _source_file(key)
+        return (source, FORMATS['jpeg'][1]) if source else None
+
+    cache = get_variant_cache()
+    cache_key = variant_key(key, size, fmt)
+    path = cache.get(cache_key)
+    if path is None:
+        source = _source_file(key)
+        frame = cv2.imread(source, cv2.IMREAD_COLOR) if source else None
+        if frame is None:
+            return None
+        path = cache.put(cache_key, render_variant(frame, size, fmt))
+    return path, FORMATS[fmt][1]
@@ -0,0 +1,220 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from flask import current_app, has_app_context
+from api.service.batch_scheduler import MicroBatcher
+from api.service.metrics import observe_outcome, observe_prediction, span
+from api.service.model_registry import POTHOLE_IMGSZ, WASTE_IMGSZ
+from api.service.tiled_inference import adaptive_predict, result_boxes
+
+CONFIDENCE = 0.5 # आत्मविश्वासको सीमा (Confidence Threshold)
+
+# दुवै मोडल एकै पटक चलाउने worker थ्रेडहरू (torch ले inference को बेला GIL छोड्छ);
+# पहिलो प्रयोगमा INFERENCE_MAX_CONCURRENT अनुसार बन्छ
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+# Micro-batching: मोडल अनुसार एउटा scheduler ('pothole' / 'waste')
+_BATCHERS = {}
+_BATCHERS_LOCK = threading.Lock()
+
+
+def prepare_frame(frame, max_size=max(POTHOLE_IMGSZ, WASTE_IMGSZ)):
+    """
+    ठूलो तस्बिरलाई एक पटक मात्र सबैभन्दा ठूलो model imgsz सम्म सानो बनाउँछ,
+    ताकि दुवै मोडलले यही frame बाट आफ्नो letterbox गरून्।
+    """
+    h, w = frame.shape[:2]
+    scale = max_size / max(h, w)
+    if scale >= 1:
+        return frame
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def _get_executor():
+    """
+    Admission ले एकै पटक INFERENCE_MAX_CONCURRENT वटा requests भित्र पठाउँछ र हरेकले दुई
+    मोडल चलाउँछ, त्यसैले pool = INFERENCE_MAX_CONCURRENT x 2 (0/असीमित भए CPU संख्या x 2)।
+    """
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                if has_app_context():
+                    concurrent = current_app.config.get('INFERENCE_MAX_CONCURRENT', 1)
+                else:
+                    concurrent = int(os.environ.get('INFERENCE_MAX_CONCURRENT', 1))
+                if concurrent <= 0:
+                    concurrent = os.cpu_count() or 1
+                _EXECUTOR = ThreadPoolExecutor(max_workers=concurrent * 2, thread_name_prefix='inference')
+    return _EXECUTOR
+
+
+def to_full_frame(result, frame):
+    """
+    Shared (सानो बनाइएको) frame मा आएको result लाई मूल `frame` मा सार्छ: boxes scale गरेर
+    orig_img पनि full-res `frame` राखिन्छ, ताकि plot() / saved तस्बिर र variants पूरा resolution मा बनून्।
+    """
+    shared_shape = result.orig_shape[:2]
+    if tuple(shared_shape) == tuple(frame.shape[:2]):
+        return result
+    scale = max(frame.shape[:2]) / max(shared_shape)
+    xyxy, scores, classes = result_boxes(result)
+    data = np.column_stack([xyxy * scale, scores, classes])
+
+    original = result.boxes.data
+    if type(original).__module__.startswith('torch'):
+        import torch
+        data = torch.as_tensor(data, dtype=original.dtype, device=original.device)
+    scaled = result.new()
+    # update() ले boxes लाई orig_shape भित्र clip गर्छ, त्यसैले पहिले नै मूल frame राख्ने
+    scaled.orig_img = frame
+    scaled.orig_shape = frame.shape[:2]
+    scaled.update(boxes=data)
+    return scaled
+
+
+def letterbox(frame, imgsz, color=(114, 114, 114)):
+    """
+    Ultralytics जस्तै aspect ratio राखेर `imgsz` x `imgsz` मा resize + pad गर्छ।
+    (image, ratio, (pad_x, pad_y)) फर्काउँछ।
+    """
+    h, w = frame.shape[:2]
+    ratio = min(imgsz / h, imgsz / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+    if (new_w, new_h) != (w, h):
+        frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    pad_x, pad_y = (imgsz - new_w) / 2, (imgsz - new_h) / 2
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    frame = cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=color)
+    return frame, ratio, (left, top)
+
+
+def _predict(name, model, frame, imgsz, full_frame=None, tiling=None):
+    with span(f'predict_{name}'):
+        if tiling:
+            result = adaptive_predict(name, model, full_frame, frame, imgsz, tiling[name], CONFIDENCE)
+        else:
+            result = model.predict(source=frame, imgsz=imgsz, conf=CONFIDENCE, save=False, verbose=False)[0]
+    observe_prediction(name, result)
+    return result
+
+
+def _predict_batch(name, model, frames, imgsz):
+    results = model.predict(source=frames, imgsz=imgsz, conf=CONFIDENCE, save=False, verbose=False)
+    for result in results:
+        observe_prediction(name, result)
+    return results
+
+
+def _get_batcher(name, model, imgsz, batching):
+    batcher = _BATCHERS.get(name)
+    if batcher is not None and batcher.model is model:
+        return batcher
+    with _BATCHERS_LOCK:
+        batcher = _BATCHERS.get(name)
+        if batcher is None or batcher.model is not model:
+            batcher = MicroBatcher(
+                name,
+                lambda frames: _predict_batch(name, model, frames, imgsz),
+                max_batch_size=batching.get('max_batch_size', 8),
+                max_wait_ms=batching.get('max_wait_ms', 5)
+            )
+            batcher.model = model
+            _BATCHERS[name] = batcher
+    return batcher
+
+
+def batching_stats():
+    """प्रत्येक मोडलको micro-batching metrics (batch size, queue wait, batch latency)।"""
+    return {name: batcher.stats() for name, batcher in _BATCHERS.items()}
+
+
+def run_detection(frame, pothole_model, waste_model, concurrent=True, batching=None, tiling=None):
+    """
+    साझा frame मा pothole र waste मोडल चलाएर (detection_type, result) फर्काउँछ।
+    Pothole लाई सधैं प्राथमिकता दिइन्छ; केही नभेटिए (None, None)। फर्किएको result का
+    boxes र orig_img मूल `frame` (full-res) का हुन्छन्।
+
+    `batching` दिइएमा ({'max_batch_size': N, 'max_wait_ms': ms}) frames लाई अरू
+    requests सँग एउटै batch मा चलाइन्छ। `tiling` ({model: params}) दिइएमा adaptive
+    (low-res pass + ROI tiles) inference चल्छ; यसले आफ्नै tiles batch गर्ने भएकाले batching लागू हुँदैन।
+    """
+    shared = prepare_frame(frame)
+
+    if batching and not tiling:
+        pothole_future = _get_batcher('pothole', pothole_model, POTHOLE_IMGSZ, batching).submit(shared)
+        waste_future = _get_batcher('waste', waste_model, WASTE_IMGSZ, batching).submit(shared)
+        return _pick(frame, pothole_future, waste_future)
+
+    if not concurrent:
+        pothole_result = _predict('pothole', pothole_model, shared, POTHOLE_IMGSZ, frame, tiling)
+        if len(pothole_result.boxes) > 0:
+            observe_outcome('pothole', False)
+            return 'pothole', to_full_frame(pothole_result, frame)
+        waste_result = _predict('waste', waste_model, shared, WASTE_IMGSZ, frame, tiling)
+        if len(waste_result.boxes) > 0:
+            observe_outcome('waste', True)
+            return 'waste', to_full_frame(waste_result, frame)
+        observe_outcome(None, True)
+        return None, None
+
+    # ---------- दुवै मोडल समानान्तर रूपमा ----------
+    executor = _get_executor()
+    pothole_future = executor.submit(_predict, 'pothole', pothole_model, shared, POTHOLE_IMGSZ, frame, tiling)
+    waste_future = executor.submit(_predict, 'waste', waste_model, shared, WASTE_IMGSZ, frame, tiling)
+    return _pick(frame, pothole_future, waste_future)
+
+
+def _pick(frame, pothole_future, waste_future):
+    pothole_result = pothole_future.result()
+    if len(pothole_result.boxes) > 0:
+        # Waste मोडल पनि सँगै चलिसकेको (वा चलिरहेको) छ, तर नतिजा प्रयोग हुँदैन
+        observe_outcome('pothole', False, waste_discarded=True)
+        return 'pothole', to_full_frame(pothole_result, frame)
+
+    waste_result = waste_future.result()
+    if len(waste_result.boxes) > 0:
+        observe_outcome('waste', True)
+        return 'waste', to_full_frame(waste_result, frame)
+
+    observe_outcome(None, True)
+    return None, None
+
+
+def run_detection_batch(frames, pothole_model, waste_model, tiling=None):
+    """
+    धेरै frames (bulk / video) का लागि: pothole मोडल सबैमा एउटै batch मा, त्यसपछि waste
+    मोडल pothole नभेटिएका frames मा मात्र। प्रत्येक frame को (detection_type, result) सूची।
+    Adaptive mode मा हरेक frame को tiles फरक हुने भएकाले frame-by-frame चल्छ।
+    """
+    if not frames:
+        return []
+    if tiling:
+        return [run_detection(frame, pothole_model, waste_model, concurrent=False, tiling=tiling) for frame in frames]
+    shared = [prepare_frame(frame) for frame in frames]
+    outcomes = [(None, None)] * len(frames)
+
+    with span('predict_pothole_batch'):
+        pothole_results = _predict_batch('pothole', pothole_model, shared, POTHOLE_IMGSZ)
+    misses = []
+    for i, result in enumerate(pothole_results):
+        if len(result.boxes) > 0:
+            outcomes[i] = ('pothole', to_full_frame(result, frames[i]))
+        else:
+            misses.append(i)
+
+    if misses:
+        with span('predict_waste_batch'):
+            waste_results = _predict_batch('waste', waste_model, [shared[i] for i in misses], WASTE_IMGSZ)
+        for i, result in zip(misses, waste_results):
+            if len(result.boxes) > 0:
+                outcomes[i] = ('waste', to_full_frame(result, frames[i]))
+
+    for detection_type, _ in outcomes:
+        observe_outcome(detection_type, detection_type != 'pothole')
+    return outcomes
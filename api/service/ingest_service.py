@@ -0,0 +1,149 @@
+from flask import current_app
+from sqlalchemy import and_, or_
+from database import db
+from api.models.detection_model import Pothole, Waste
+from api.service.dedup_cache import (
+    NO_DETECTION, PERCEPTUAL_PREFIX, content_hash, get_cache, hamming_distance, perceptual_bands, perceptual_hash
+)
+from api.service.detection_service import classify_frame, decode_image, save_detection_images
+from api.service.merge_service import find_open_detection, merge_report
+from api.service.metrics import span
+from api.service.record_service import save_detection_record
+
+MODELS = {'pothole': Pothole, 'waste': Waste}
+# एउटा band मिल्ने बढीमा यति rows मात्र popcount जाँचका लागि ल्याइन्छ
+PERCEPTUAL_CANDIDATES = 200
+
+# ingest_upload को नतिजा
+CREATED = 'created'
+DUPLICATE = 'duplicate'
+MERGED = 'merged'
+NOT_DETECTED = 'not_detected'
+
+
+def _cached_record(cache, key):
+    """LRU मा भएको (type, id) बाट record ल्याउँछ; record मेटिएको भए entry हटाउँछ।"""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if entry == NO_DETECTION:
+        return NO_DETECTION
+    record = db.session.get(MODELS[entry[0]], entry[1])
+    if record is None:
+        cache.discard(key)
+    return (entry[0], record) if record is not None else None
+
+
+def _stored_record(column, value):
+    """Hash column (indexed) बाट पहिले नै बचत भएको detection खोज्छ।"""
+    for detection_type, model in MODELS.items():
+        record = model.query.filter(getattr(model, column) == value).order_by(model.id).first()
+        if record is not None:
+            return detection_type, record
+    return None
+
+
+def _similar_record(phash, max_distance):
+    """
+    `max_distance` bits भित्रको सबैभन्दा नजिकको perceptual hash भएको detection: कुनै band
+    ठ्याक्कै मिल्ने rows (indexed) ल्याएर Hamming distance जाँच।
+    """
+    bands = perceptual_bands(phash)
+    best = None
+    for detection_type, model in MODELS.items():
+        # Band 0 = hash को prefix: perceptual_hash index मै range scan
+        conditions = [and_(model.perceptual_hash >= bands[0], model.perceptual_hash < bands[0] + '~')]
+        conditions += [getattr(model, f'perceptual_band{i}') == band for i, band in enumerate(bands[1:], 1)]
+        query = model.query.filter(or_(*conditions)).order_by(model.id).limit(PERCEPTUAL_CANDIDATES)
+        for record in query:
+            distance = hamming_distance(phash, record.perceptual_hash)
+            if distance <= max_distance and (best is None or distance < best[0]):
+                best = (distance, detection_type, record)
+    return best[1:] if best else None
+
+
+def find_duplicate(data, frame=None):
+    """
+    पहिले नै प्रशोधन भएको upload खोज्छ: पहिले bytes को SHA-256 (LRU, त्यसपछि DB),
+    DEDUP_PERCEPTUAL खुला भए DEDUP_PERCEPTUAL_DISTANCE bits भित्रको dHash भएको लगभग उस्तै तस्बिर पनि।
+    (match, hashes) फर्काउँछ; match = (type, record), NO_DETECTION वा None।
+    """
+    cache = get_cache(current_app.config.get('DEDUP_CACHE_SIZE', 10000))
+    hashes = {'content_hash': content_hash(data)}
+    if frame is not None:
+        # सस्तो छ, त्यसैले सधैं बचत गर्ने; DEDUP_PERCEPTUAL खोल्दा पुराना rows पनि काम लाग्छन्
+        hashes['perceptual_hash'] = perceptual_hash(frame)
+
+    match = _cached_record(cache, hashes['content_hash'])
+    if match is not None:
+        cache.count('memory_hits')
+        return match, hashes
+
+    match = _stored_record('content_hash', hashes['content_hash'])
+    if match is not None:
+        cache.count('db_hits')
+        cache.put(hashes['content_hash'], (match[0], match[1].id))
+        return match, hashes
+
+    if current_app.config.get('DEDUP_PERCEPTUAL', False) and hashes.get('perceptual_hash'):
+        max_distance = current_app.config.get('DEDUP_PERCEPTUAL_DISTANCE', 3)
+        key = cache.similar(hashes['perceptual_hash'], max_distance)
+        match = _cached_record(cache, key) if key else None
+        if match is None:
+            match = _similar_record(hashes['perceptual_hash'], max_distance)
+        if match is not None:
+            cache.count('perceptual_hits')
+            return match, hashes
+
+    cache.count('misses')
+    return None, hashes
+
+
+def remember(hashes, detection_type, record):
+    cache = get_cache(current_app.config.get('DEDUP_CACHE_SIZE', 10000))
+    value = (detection_type, record.id) if record is not None else NO_DETECTION
+    cache.put(hashes['content_hash'], value)
+    if record is not None and hashes.get('perceptual_hash'):
+        cache.put(PERCEPTUAL_PREFIX + hashes['perceptual_hash'], value)
+
+
+def ingest_upload(data, filename, location, latitude, longitude):
+    """
+    एउटा upload को पूरा pipeline: duplicate जाँच, inference, नजिकको खुला detection मा
+    merge, नत्र फाइल र DB row बचत।
+
+    (detection_type, record, outcome) फर्काउँछ; outcome CREATED, DUPLICATE, MERGED वा
+    NOT_DETECTED हुन्छ (पछिल्लो अवस्थामा detection_type र record None)।
+    """
+    with span('decode'):
+        frame = decode_image(data)
+
+    with span('dedup'):
+        match, hashes = find_duplicate(data, frame)
+    if match == NO_DETECTION:
+        return None, None, NOT_DETECTED
+    if match is not None:
+        return match[0], match[1], DUPLICATE
+
+    with span('inference'):
+        detection_type, result, result_data = classify_frame(frame)
+    if not detection_type:
+        remember(hashes, None, None)
+        return None, None, NOT_DETECTED
+
+    # ---------- उही ठाउँको दोहोरिएको रिपोर्ट: नयाँ row/फाइल नबनाई count बढाउने ----------
+    with span('merge'):
+        existing = find_open_detection(detection_type, result_data, latitude, longitude)
+        if existing is not None:
+            record = merge_report(existing)
+    if existing is not None:
+        remember(hashes, detection_type, record)
+        return detection_type, record, MERGED
+
+    result_data['image_name'], result_data['detected_image_path'] = save_detection_images(
+        detection_type, filename, data, result
+    )
+    result_data.update(hashes)
+    record = save_detection_record(detection_type, result_data, location, latitude, longitude)
+    remember(hashes, detection_type, record)
+    return detection_type, record, CREATED
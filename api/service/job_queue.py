@@ -0,0 +1,172 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Job अवस्थाहरू
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class JobQueue:
+    """
+    बाहिरी broker बिना चल्ने SQLite-आधारित job queue। Web process ले job राख्छ र
+    worker processes ले `claim()` गरेर एक-एक गरी लिन्छन्।
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            # पुरानो queue फाइलमा lease column नभए थप्ने
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            if 'heartbeat_at' not in columns:
+                conn.execute('ALTER TABLE jobs ADD COLUMN heartbeat_at REAL')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """यो thread को connection बन्द गर्छ (heartbeat जस्ता छोटो आयुका threads का लागि)।"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def enqueue(self, kind, payload):
+        job_id = uuid.uuid4().hex
+        self._connect().execute(
+            'INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, ?, ?, ?)',
+            (job_id, kind, QUEUED, json.dumps(payload), time.time())
+        )
+        return job_id
+
+    def claim(self):
+        """सबैभन्दा पुरानो queued job लाई atomically running बनाएर फर्काउँछ (नभए None)।"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1', (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            now = time.time()
+            conn.execute(
+                'UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1 WHERE id = ?',
+                (RUNNING, now, now, row['id'])
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        job = self._to_dict(row)
+        job['status'] = RUNNING
+        return job
+
+    def complete(self, job_id, result):
+        self._finish(job_id, DONE, result=json.dumps(result))
+
+    def fail(self, job_id, error):
+        self._finish(job_id, FAILED, error=str(error))
+
+    def _finish(self, job_id, status, result=None, error=None):
+        self._connect().execute(
+            'UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?',
+            (status, result, error, time.time(), job_id)
+        )
+
+    def heartbeat(self, job_id):
+        """चलिरहेको job को lease नवीकरण (worker जीवित छ भन्ने संकेत)।"""
+        self._connect().execute(
+            'UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?', (time.time(), job_id, RUNNING)
+        )
+
+    def requeue_stale(self, lease_seconds, max_attempts=None):
+        """
+        `lease_seconds` भित्र heartbeat नआएका running jobs (worker मरेको) लाई फेरि queue मा
+        फर्काउँछ। लामो भए पनि heartbeat पठाइरहेका jobs (जस्तै video) छोइँदैनन्।
+        `max_attempts` पटक claim भइसकेका (जस्तै हरेक पटक worker नै crash गराउने) jobs चाहिँ
+        फेरि नफर्काई failed बनाइन्छन्। फेरि queue मा फर्किएका jobs को संख्या फर्काउँछ।
+        """
+        conn = self._connect()
+        now = time.time()
+        stale = 'status = ? AND COALESCE(heartbeat_at, started_at) < ?'
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if max_attempts:
+                conn.execute(
+                    f'UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE {stale} AND attempts >= ?',
+                    (FAILED, f'Worker lease expired after {max_attempts} attempts', now,
+                     RUNNING, now - lease_seconds, max_attempts)
+                )
+            cursor = conn.execute(
+                f'UPDATE jobs SET status = ? WHERE {stale}', (QUEUED, RUNNING, now - lease_seconds)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount
+
+    def get(self, job_id):
+        row = self._connect().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    @staticmethod
+    def _to_dict(row):
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'payload': json.loads(row['payload']),
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'heartbeat_at': row['heartbeat_at'],
+            'finished_at': row['finished_at']
+        }
+
+
+_QUEUES = {}
+
+
+def get_job_queue(path):
+    """प्रति process, प्रति path एउटै JobQueue।"""
+    queue = _QUEUES.get(path)
+    if queue is None:
+        queue = _QUEUES[path] = JobQueue(path)
+    return queue
@@ -0,0 +1,207 @@
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from flask import current_app
+from werkzeug.utils import secure_filename
+from database import db
+from api.service.ingest_service import ingest_upload
+from api.service.job_queue import get_job_queue
+from api.service.model_registry import warm_up
+from api.service.video_service import process_video
+
+
+def _job_queue():
+    return get_job_queue(current_app.config['JOB_QUEUE_PATH'])
+
+
+def enqueue_detection_job(image, location, latitude, longitude):
+    """
+    Upload लाई JOB_FOLDER मा राखेर 'detect' job queue गर्छ र job id फर्काउँछ।
+    Decode/inference/DB commit सबै worker process मा हुन्छ।
+    """
+    job_folder = current_app.config['JOB_FOLDER']
+    os.makedirs(job_folder, exist_ok=True)
+
+    filename = image.filename or 'upload.jpg'
+    upload_path = os.path.join(job_folder, f"{uuid.uuid4().hex}_{secure_filename(filename)}")
+    image.save(upload_path)
+
+    return _job_queue().enqueue('detect', {
+        'upload_path': upload_path,
+        'filename': filename,
+        'location': location,
+        'latitude': latitude,
+        'longitude': longitude
+    })
+
+
+def get_job_status(job_id):
+    """GET /jobs/<id> का लागि job को सार्वजनिक विवरण (payload बिना)।"""
+    job = _job_queue().get(job_id)
+    if job is None:
+        return None
+    job.pop('payload')
+    return job
+
+
+def handle_detect_job(payload):
+    """Worker भित्र एउटा upload को detection गरेर DB row लेख्छ।"""
+    upload_path = payload['upload_path']
+    try:
+        with open(upload_path, 'rb') as f:
+            data = f.read()
+
+        detection_type, record, outcome = ingest_upload(
+            data, payload['filename'],
+            payload['location'], payload['latitude'], payload['longitude']
+        )
+        if not detection_type:
+            return {
+                'detection_type': None,
+                'outcome': outcome,
+                'message': 'No pothole or waste detected in the image'
+            }
+        return {
+            'detection_type': detection_type,
+            'outcome': outcome,
+            'message': f'{detection_type.capitalize()} detected successfully',
+            'data': record.to_dict()
+        }
+    finally:
+        if os.path.exists(upload_path):
+            os.remove(upload_path)
+
+
+def enqueue_video_job(video, track, location):
+    """Video (र optional GPS track) JOB_FOLDER मा राखेर 'video' job queue गर्छ।"""
+    job_folder = current_app.config['JOB_FOLDER']
+    os.makedirs(job_folder, exist_ok=True)
+
+    prefix = uuid.uuid4().hex
+    video_path = os.path.join(job_folder, f"{prefix}_{secure_filename(video.filename or 'video.mp4')}")
+    video.save(video_path)
+    track_path = None
+    if track:
+        track_path = os.path.join(job_folder, f"{prefix}_{secure_filename(track.filename or 'track.csv')}")
+        track.save(track_path)
+
+    return _job_queue().enqueue('video', {
+        'video_path': video_path,
+        'video_name': video.filename,
+        'track_path': track_path,
+        'location': location
+    })
+
+
+def handle_video_job(payload):
+    """Worker भित्र पूरा video प्रशोधन गर्छ (video_service.process_video)।"""
+    try:
+        return process_video(
+            payload['video_path'], payload['track_path'], payload['location'],
+            video_name=payload['video_name']
+        )
+    finally:
+        for path in (payload['video_path'], payload['track_path']):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+
+JOB_HANDLERS = {
+    'detect': handle_detect_job,
+    'video': handle_video_job
+}
+
+
+@contextmanager
+def _heartbeat(queue, job_id, interval):
+    """Handler चल्दासम्म background thread ले हरेक `interval` s मा job को lease नवीकरण गर्छ।"""
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                queue.heartbeat(job_id)
+        finally:
+            queue.close()
+
+    thread = threading.Thread(target=beat, name=f'job-heartbeat-{job_id[:8]}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(app, poll_interval=0.5, lease_s=None, max_jobs=None):
+    """
+    एउटा worker loop: queue बाट job लिने, handler चलाउने, नतिजा लेख्ने।
+    चलिरहेको job ले heartbeat पठाउँछ; JOB_LEASE_S भित्र heartbeat नआएका (worker मरेका)
+    jobs मात्र फेरि queue मा फर्किन्छन्, त्यसैले लामो video job दोहोरिँदैन; JOB_MAX_ATTEMPTS
+    पटक चलिसकेका चाहिँ failed हुन्छन्।
+    `max_jobs` दिइएमा त्यति job पछि रोकिन्छ।
+    """
+    processed = 0
+    lease_s = lease_s or app.config.get('JOB_LEASE_S', 60)
+    max_attempts = app.config.get('JOB_MAX_ATTEMPTS', 3)
+    with app.app_context():
+        queue = get_job_queue(app.config['JOB_QUEUE_PATH'])
+        queue.requeue_stale(lease_s, max_attempts)
+        last_sweep = time.monotonic()
+
+        while max_jobs is None or processed < max_jobs:
+            # अरू worker मरेमा पनि उसका jobs समयमै फर्किऊन् (startup मा मात्र होइन)
+            if time.monotonic() - last_sweep >= lease_s:
+                queue.requeue_stale(lease_s, max_attempts)
+                last_sweep = time.monotonic()
+
+            job = queue.claim()
+            if job is None:
+                time.sleep(poll_interval)
+                continue
+
+            handler = JOB_HANDLERS.get(job['kind'])
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown job kind: {job['kind']}")
+                with _heartbeat(queue, job['id'], max(1.0, lease_s / 4)):
+                    result = handler(job['payload'])
+                queue.complete(job['id'], result)
+            except Exception as e:
+                db.session.rollback()
+                print(f"Job {job['id']} failed: {e}")
+                queue.fail(job['id'], e)
+            finally:
+                db.session.remove()
+            processed += 1
+
+
+def _worker_main(poll_interval):
+    # प्रत्येक worker process ले आफ्नै app (र DB connection pool) बनाउँछ र
+    # पहिलो job अघि नै मोडल load + warm-up गर्छ
+    from app import create_app
+    app = create_app()
+    warm_up()
+    run_worker(app, poll_interval)
+
+
+def start_worker_pool(processes, poll_interval=0.5):
+    """`processes` वटा inference worker processes सुरु गरेर तिनीहरू नसकिएसम्म पर्खन्छ।"""
+    ctx = multiprocessing.get_context('spawn')
+    workers = [
+        ctx.Process(target=_worker_main, args=(poll_interval,), name=f'detection-worker-{i}')
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func
+from database import db
+from api.service.geo import haversine_m
+from api.service.spatial_service import within_radius
+from api.service.stats_service import record_merged_report
+
+# यी status भएका detections बन्द मानिन्छन्; नयाँ रिपोर्ट तिनमा merge हुँदैन
+CLOSED_STATUSES = ('resolved', 'fixed', 'repaired', 'closed', 'cleaned', 'collected')
+
+
+def find_open_detection(detection_type, result_data, latitude, longitude, now=None):
+    """
+    MERGE_RADIUS_M metres र MERGE_WINDOW_HOURS भित्र रिपोर्ट भएको, उही प्रकारको (waste
+    भए उही category) खुला detection खोज्छ। सबैभन्दा नजिकको record वा None फर्काउँछ।
+    """
+    radius_m = current_app.config.get('MERGE_RADIUS_M', 0)
+    if not radius_m or latitude is None or longitude is None:
+        return None
+
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(hours=current_app.config.get('MERGE_WINDOW_HOURS', 24))
+
+    def criteria(_, model):
+        status_column = model.status if detection_type == 'pothole' else model.detection_status
+        conditions = [
+            func.coalesce(model.last_reported_at, model.timestamp) >= cutoff,
+            func.lower(func.coalesce(status_column, '')).notin_(CLOSED_STATUSES)
+        ]
+        if detection_type == 'waste':
+            conditions.append(model.waste_category == result_data.get('waste_category'))
+        return conditions
+
+    matches = within_radius([detection_type], latitude, longitude, radius_m, limit=1, criteria=criteria)
+    return matches[0][1] if matches else None
+
+
+def merge_report(record, now=None, commit=True):
+    """
+    नयाँ रिपोर्टलाई पुरानो record मा जोड्छ: report_count बढाउने (SQL मै, race-safe)।
+    Bulk ingestion ले `commit=False` दिएर आफ्नै transaction मा commit गर्छ।
+    """
+    model = type(record)
+    # Query.update ORM flush बाहिर चल्छ, त्यसैले stats rollup पनि उही transaction मा हातैले
+    record_merged_report(record)
+    model.query.filter_by(id=record.id).update({
+        model.report_count: model.report_count + 1,
+        model.last_reported_at: now or datetime.utcnow()
+    }, synchronize_session=False)
+    if commit:
+        db.session.commit()
+    db.session.refresh(record)
+    return record
+
+
+def find_pending_match(records, detection_type, result_data, latitude, longitude):
+    """
+    Bulk ingestion: अझै insert नभएका (उही batch का) records मध्ये merge हुने record खोज्छ।
+    """
+    radius_m = current_app.config.get('MERGE_RADIUS_M', 0)
+    if not radius_m or latitude is None or longitude is None:
+        return None
+    for record_type, record in records:
+        if record_type != detection_type:
+            continue
+        if detection_type == 'waste' and record.waste_category != result_data.get('waste_category'):
+            continue
+        if haversine_m(latitude, longitude, record.latitude, record.longitude) <= radius_m:
+            return record
+    return None
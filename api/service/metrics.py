@@ -0,0 +1,207 @@
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, has_request_context, request
+
+# Latency buckets (seconds) — decode को ms देखि CPU inference को सेकेन्डसम्म
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_REGISTRY = []
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Prometheus counter (process-local)। `inc(**labels)`।"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels.get(name, '')) for name in self.labelnames), 0)
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """Prometheus histogram (cumulative buckets, _sum, _count)।"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def totals(self, **labels):
+        """(sum, count) — benchmarks/tests का लागि।"""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            return (state[1], state[2]) if state else (0.0, 0)
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, key, [('le', _format_value(bound))])
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = _format_labels(self.labelnames, key, [('le', '+Inf')])
+                lines.append(f'{self.name}_bucket{labels} {count}')
+                lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {total!r}')
+                lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {count}')
+        return lines
+
+
+class Gauge:
+    """Scrape बेला `fn()` बोलाएर मान पढ्ने gauge (queue depth जस्ता)।"""
+
+    def __init__(self, name, documentation, fn):
+        self.name = name
+        self.documentation = documentation
+        self.fn = fn
+        _REGISTRY.append(self)
+
+    def collect(self):
+        value = self.fn()
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge']
+        if value is not None:
+            lines.append(f'{self.name} {_format_value(value)}')
+        return lines
+
+
+# ---------- Detection pipeline metrics ----------
+REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency.', ('method', 'endpoint', 'status')
+)
+STAGE_SECONDS = Histogram(
+    'detection_stage_duration_seconds',
+    'Time spent in each stage of the detection path (upload_read, decode, dedup, predict_*, merge, '
+    'storage_write, annotate, variants, db_commit).',
+    ('stage',)
+)
+MODEL_RUNS = Counter('detection_model_runs_total', 'Images passed through each model.', ('model',))
+MODEL_HITS = Counter('detection_model_hits_total', 'Images whose final detection came from each model.', ('model',))
+WASTE_AFTER_POTHOLE_MISS = Counter(
+    'detection_waste_after_pothole_miss_total',
+    'Images where the pothole model found nothing and the waste model result had to be used.'
+)
+WASTE_DISCARDED = Counter(
+    'detection_waste_runs_discarded_total',
+    'Images where the waste model ran alongside the pothole model but the pothole hit made its result unused.'
+)
+BOXES_PER_IMAGE = Histogram(
+    'detection_boxes_per_image', 'Boxes returned per image by each model.', ('model',),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50)
+)
+
+
+@contextmanager
+def span(stage):
+    """
+    Pipeline को एउटा stage को समय नाप्छ: histogram मा observe, र request भित्र भए
+    Server-Timing header का लागि g मा पनि जम्मा।
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        if has_request_context():
+            timings = g.setdefault('stage_timings', {})
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def observe_prediction(model, result):
+    """एउटा image मा एउटा model चल्यो: run र boxes संख्या।"""
+    MODEL_RUNS.inc(model=model)
+    BOXES_PER_IMAGE.observe(len(result.boxes), model=model)
+
+
+def observe_outcome(detection_type, pothole_missed, waste_discarded=False):
+    """
+    अन्तिम निर्णय: कुन model को hit, pothole नभेटिएर waste model को नतिजा हेर्नुपरेको, र
+    समानान्तर चलेको waste run pothole hit ले गर्दा खेर गएको।
+    """
+    if detection_type:
+        MODEL_HITS.inc(model=detection_type)
+    if pothole_missed:
+        WASTE_AFTER_POTHOLE_MISS.inc()
+    if waste_discarded:
+        WASTE_DISCARDED.inc()
+
+
+def render():
+    """सबै metrics Prometheus text exposition format (0.0.4) मा।"""
+    lines = []
+    for metric in _REGISTRY:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+def init_metrics(app):
+    """हरेक request को latency र stage timings (Server-Timing header) दर्ता गर्छ।"""
+
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        REQUEST_SECONDS.observe(
+            elapsed, method=request.method, endpoint=request.endpoint or 'unmatched', status=response.status_code
+        )
+        timings = g.get('stage_timings')
+        if timings:
+            response.headers['Server-Timing'] = ', '.join(
+                f'{stage};dur={seconds * 1000:.1f}' for stage, seconds in timings.items()
+            )
+        return response
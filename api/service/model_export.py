@@ -0,0 +1,180 @@
+import glob
+import os
+import numpy as np
+import cv2
+from api.service.inference_engine import letterbox
+from api.service.model_registry import MODEL_SPECS, load_model, model_path
+
+IMAGE_EXTENSIONS = ('*.jpg', '*.jpeg', '*.png')
+
+
+def dataset_images(name, split='test', limit=None):
+    """`name` मोडलको dataset (POTHOLE_DATASET / Waste-Detection-YOLO-1) को तस्बिर पथहरू।"""
+    folder = os.path.join(MODEL_SPECS[name]['dataset'], split, 'images')
+    paths = sorted(p for ext in IMAGE_EXTENSIONS for p in glob.glob(os.path.join(folder, ext)))
+    return paths[:limit] if limit else paths
+
+
+def label_path(image_path):
+    """`<split>/images/x.jpg` को YOLO label `<split>/labels/x.txt`।"""
+    folder, name = os.path.split(image_path)
+    return os.path.join(os.path.dirname(folder), 'labels', os.path.splitext(name)[0] + '.txt')
+
+
+def load_labels(image_path):
+    """
+    YOLO label फाइलबाट ground truth: (xyxy normalized (N,4), cls (N,))। Roboflow ले polygon
+    (segmentation) labels दिएको भए त्यसको bounding box लिइन्छ।
+    """
+    boxes, classes = [], []
+    path = label_path(image_path)
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                values = line.split()
+                if len(values) < 5:
+                    continue
+                cls, coords = int(values[0]), np.asarray(values[1:], dtype=np.float32)
+                if len(coords) == 4:
+                    cx, cy, w, h = coords
+                    boxes.append([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2])
+                else:
+                    xs, ys = coords[0::2], coords[1::2]
+                    boxes.append([xs.min(), ys.min(), xs.max(), ys.max()])
+                classes.append(cls)
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4), np.asarray(classes, dtype=int)
+
+
+class _CalibrationReader:
+    """ONNX static INT8 quantization का लागि valid split का letterboxed तस्बिरहरू।"""
+
+    def __init__(self, input_name, name, limit):
+        self.input_name = input_name
+        self.imgsz = MODEL_SPECS[name]['imgsz']
+        self.paths = iter(dataset_images(name, 'valid', limit))
+
+    def get_next(self):
+        for path in self.paths:
+            frame = cv2.imread(path)
+            if frame is None:
+                continue
+            image, _, _ = letterbox(frame, self.imgsz)
+            blob = image[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+            return {self.input_name: np.ascontiguousarray(blob)}
+        return None
+
+
+def export_model(name, fmt='onnx', int8=False, calibration_images=200):
+    """
+    `name` को PyTorch checkpoint लाई तालिमकै imgsz मा ONNX वा OpenVINO मा export गर्छ।
+    Batching चल्न सकोस् भनेर dynamic batch axis राखिन्छ। बनेको पथ फर्काउँछ।
+    """
+    from ultralytics import YOLO
+
+    spec = MODEL_SPECS[name]
+    model = YOLO(spec['path'], task='detect')
+
+    if fmt == 'openvino':
+        kwargs = {'format': 'openvino', 'imgsz': spec['imgsz'], 'dynamic': True}
+        if int8:
+            # NNCF post-training quantization: dataset को data.yaml बाट calibration
+            kwargs.update(int8=True, data=os.path.join(spec['dataset'], 'data.yaml'))
+        exported = model.export(**kwargs)
+        target = model_path(name, 'openvino-int8' if int8 else 'openvino')
+        if os.path.abspath(exported) != os.path.abspath(target):
+            os.replace(exported, target)
+        return target
+
+    if fmt != 'onnx':
+        raise ValueError(f'Unsupported export format: {fmt}')
+
+    exported = model.export(format='onnx', imgsz=spec['imgsz'], dynamic=True, simplify=True)
+    if not int8:
+        return exported
+
+    import onnxruntime
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+    input_name = onnxruntime.InferenceSession(
+        exported, providers=['CPUExecutionProvider']
+    ).get_inputs()[0].name
+    target = model_path(name, 'onnx-int8')
+    quantize_static(
+        exported, target,
+        _CalibrationReader(input_name, name, calibration_images),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True
+    )
+    return target
+
+
+def _iou(a, b):
+    x1, y1 = np.maximum(a[:2], b[:2])
+    x2, y2 = np.minimum(a[2:], b[2:])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _boxes(result):
+    boxes = result.boxes
+    return (
+        boxes.xyxy.cpu().numpy().reshape(-1, 4),
+        boxes.conf.cpu().numpy().reshape(-1),
+        boxes.cls.cpu().numpy().reshape(-1).astype(int)
+    )
+
+
+def check_parity(name, backend, limit=None, conf=0.5, iou_threshold=0.5):
+    """
+    `backend` मोडलका नतिजालाई PyTorch reference सँग `<dataset>/test` तस्बिरहरूमा तुलना गर्छ।
+
+    प्रत्येक reference box को लागि उही class र IoU >= `iou_threshold` भएको box खोजिन्छ।
+    Summary dict फर्काउँछ (box recall, precision, detected/not-detected agreement आदि)।
+    """
+    imgsz = MODEL_SPECS[name]['imgsz']
+    reference = load_model(name, 'pytorch')
+    candidate = load_model(name, backend)
+
+    stats = {
+        'model': name, 'backend': backend, 'images': 0,
+        'reference_boxes': 0, 'candidate_boxes': 0, 'matched_boxes': 0,
+        'decision_agreement': 0, 'mean_matched_iou': 0.0, 'max_conf_diff': 0.0
+    }
+    iou_sum = 0.0
+
+    for path in dataset_images(name, 'test', limit):
+        frame = cv2.imread(path)
+        if frame is None:
+            continue
+        ref = _boxes(reference.predict(source=frame, imgsz=imgsz, conf=conf, save=False, verbose=False)[0])
+        cand = _boxes(candidate.predict(source=frame, imgsz=imgsz, conf=conf, save=False, verbose=False)[0])
+
+        stats['images'] += 1
+        stats['reference_boxes'] += len(ref[0])
+        stats['candidate_boxes'] += len(cand[0])
+        stats['decision_agreement'] += int((len(ref[0]) > 0) == (len(cand[0]) > 0))
+
+        used = set()
+        for box, score, cls in zip(*ref):
+            best, best_iou = None, iou_threshold
+            for j, (other, _, other_cls) in enumerate(zip(*cand)):
+                if j in used or other_cls != cls:
+                    continue
+                overlap = _iou(box, other)
+                if overlap >= best_iou:
+                    best, best_iou = j, overlap
+            if best is not None:
+                used.add(best)
+                stats['matched_boxes'] += 1
+                iou_sum += float(best_iou)
+                stats['max_conf_diff'] = max(stats['max_conf_diff'], float(abs(score - cand[1][best])))
+
+    images = stats['images'] or 1
+    stats['box_recall'] = stats['matched_boxes'] / stats['reference_boxes'] if stats['reference_boxes'] else 1.0
+    stats['box_precision'] = stats['matched_boxes'] / stats['candidate_boxes'] if stats['candidate_boxes'] else 1.0
+    stats['mean_matched_iou'] = iou_sum / stats['matched_boxes'] if stats['matched_boxes'] else 0.0
+    stats['decision_agreement'] = stats['decision_agreement'] / images
+    return stats
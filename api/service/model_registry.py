@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+import numpy as np
+from flask import current_app, has_app_context
+
+# Base directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BASE_DIR, '..', 'models')
+PROJECT_DIR = os.path.abspath(os.path.join(BASE_DIR, '..', '..'))
+
+# तालिम गर्दा प्रयोग भएको input size (runs/*/args.yaml हेर्नुहोस्)
+POTHOLE_IMGSZ = 640  # yolov8s, POTHOLE_DATASET/runs/detect/pothole_yolov8
+WASTE_IMGSZ = 320    # yolov8n, Waste-Detection-YOLO-1/detect/waste_yolo_fast*
+
+
+class ModelLoadError(RuntimeError):
+    """मोडल load हुन नसकेमा (None फर्काउनुको सट्टा) उठाइन्छ।"""
+
+
+MODEL_SPECS = {
+    'pothole': {
+        'path': os.path.join(MODELS_DIR, 'best.pt'),
+        'imgsz': POTHOLE_IMGSZ,
+        'dataset': os.path.join(PROJECT_DIR, 'POTHOLE_DATASET')
+    },
+    'waste': {
+        'path': os.path.join(MODELS_DIR, 'waste.pt'),
+        'imgsz': WASTE_IMGSZ,
+        'dataset': os.path.join(PROJECT_DIR, 'Waste-Detection-YOLO-1')
+    },
+}
+
+# Inference runtime: `flask detections export-models` ले .pt बाट यी फाइलहरू बनाउँछ
+BACKENDS = ('pytorch', 'onnx', 'onnx-int8', 'openvino', 'openvino-int8')
+DEFAULT_BACKEND = 'pytorch'
+
+
+def get_backend():
+    """
+    App config (INFERENCE_BACKEND, create_app मा env बाट) अनुसार runtime छान्छ (default: pytorch)।
+    App context बाहिर (benchmarks, gunicorn post_fork warm-up) environment variable नै पढिन्छ।
+    """
+    if has_app_context():
+        backend = current_app.config.get('INFERENCE_BACKEND', DEFAULT_BACKEND)
+    else:
+        backend = os.environ.get('INFERENCE_BACKEND', DEFAULT_BACKEND)
+    backend = backend.lower()
+    if backend not in BACKENDS:
+        raise ModelLoadError(f"Unknown INFERENCE_BACKEND '{backend}', expected one of {', '.join(BACKENDS)}")
+    return backend
+
+
+def model_path(name, backend=None):
+    """`name` मोडलको `backend` अनुसारको weights फाइल/फोल्डरको पथ।"""
+    backend = backend or get_backend()
+    stem = os.path.splitext(MODEL_SPECS[name]['path'])[0]
+    return {
+        'pytorch': MODEL_SPECS[name]['path'],
+        'onnx': f'{stem}.onnx',
+        'onnx-int8': f'{stem}.int8.onnx',
+        'openvino': f'{stem}_openvino_model',
+        'openvino-int8': f'{stem}_int8_openvino_model'
+    }[backend]
+
+
+_MODELS = {}
+_LOCK = threading.Lock()
+_PROCESS_STARTED = time.perf_counter()
+_STATS = {
+    'models': {},
+    'first_request_ms': None,
+    'first_request_after_start_s': None
+}
+
+
+def load_model(name, backend=None):
+    """
+    Registry मा नराखी `backend` को नयाँ मोडल instance बनाउँछ (parity check आदिका लागि)।
+    """
+    backend = backend or get_backend()
+    path = model_path(name, backend)
+    if not os.path.exists(path):
+        hint = '' if backend == 'pytorch' else ' Run `flask detections export-models` first.'
+        raise ModelLoadError(f"{backend} weights for {name} model not found at {path}.{hint}")
+    try:
+        # torch/ultralytics import महँगो छ, त्यसैले पहिलो प्रयोगमा मात्र import गर्ने
+        from ultralytics import YOLO
+        return YOLO(path, task='detect')
+    except Exception as e:
+        raise ModelLoadError(f"Error loading {name} model from {path}: {e}") from e
+
+
+def _load(name):
+    backend = get_backend()
+    started = time.perf_counter()
+    model = load_model(name, backend)
+
+    load_ms = (time.perf_counter() - started) * 1000
+    _STATS['models'][name] = {
+        'backend': backend,
+        'path': model_path(name, backend),
+        'load_ms': round(load_ms, 1),
+        'warmup_ms': None
+    }
+    print(f"Loaded {name} model ({backend}) in {load_ms:.0f} ms")
+    return model
+
+
+def get_model(name):
+    """
+    `name` ('pothole' / 'waste') को मोडल फर्काउँछ, पहिलो पटक मात्र load गरेर।
+    """
+    model = _MODELS.get(name)
+    if model is not None:
+        return model
+    with _LOCK:
+        model = _MODELS.get(name)
+        if model is None:
+            model = _MODELS[name] = _load(name)
+    return model
+
+
+def load_models():
+    """
+    सबै मोडल अहिले नै load गर्छ। Gunicorn `--preload` मा master process ले fork अघि
+    यो चलाएमा weights सबै workers बीच copy-on-write ले share हुन्छन्।
+    """
+    return {name: get_model(name) for name in MODEL_SPECS}
+
+
+def warm_up(names=None):
+    """
+    तालिमको imgsz मा dummy inference चलाएर lazy init (kernels, buffers) पहिल्यै सक्छ,
+    ताकि पहिलो वास्तविक request ढिलो नहोस्।
+    """
+    for name in names or MODEL_SPECS:
+        imgsz = MODEL_SPECS[name]['imgsz']
+        model = get_model(name)
+        started = time.perf_counter()
+        model.predict(source=np.zeros((imgsz, imgsz, 3), dtype=np.uint8), imgsz=imgsz, save=False, verbose=False)
+        warmup_ms = (time.perf_counter() - started) * 1000
+        _STATS['models'][name]['warmup_ms'] = round(warmup_ms, 1)
+        print(f"Warmed up {name} model in {warmup_ms:.0f} ms")
+
+
+def record_first_request(elapsed_ms):
+    """यो process को पहिलो detection request को latency एक पटक मात्र राख्छ।"""
+    if _STATS['first_request_ms'] is None:
+        _STATS['first_request_ms'] = round(elapsed_ms, 1)
+        _STATS['first_request_after_start_s'] = round(time.perf_counter() - _PROCESS_STARTED, 1)
+
+
+def registry_stats():
+    return {
+        'pid': os.getpid(),
+        'backend': get_backend(),
+        'loaded': sorted(_MODELS),
+        'models': _STATS['models'],
+        'first_request_ms': _STATS['first_request_ms'],
+        'first_request_after_start_s': _STATS['first_request_after_start_s']
+    }
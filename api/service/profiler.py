@@ -0,0 +1,93 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from flask import g, request
+
+
+class SamplingProfiler:
+    """
+    Opt-in sampling profiler: एउटा background thread ले `interval_s` मा दर्ता गरिएका request
+    threads को Python stack (sys._current_frames) टिप्छ। Request ढिलो भए (PROFILE_SLOW_MS)
+    collapsed stacks ("a;b;c count") फाइलमा लेखिन्छ — flamegraph.pl, speedscope वा
+    inferno मा सिधै खुल्छ। Profiling बन्द हुँदा कुनै खर्च छैन। CONCURRENT_INFERENCE=1 मा
+    predict inference threads मा चल्छ, त्यसैले model भित्रको stack हेर्न त्यसलाई 0 राख्नुहोस्।
+    """
+
+    def __init__(self, interval_s=0.005):
+        self.interval_s = interval_s
+        self._samples = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id):
+        with self._lock:
+            self._samples[thread_id] = Counter()
+            self._active.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+                self._thread.start()
+
+    def stop(self, thread_id):
+        with self._lock:
+            samples = self._samples.pop(thread_id, Counter())
+            if not self._samples:
+                self._active.clear()
+        return samples
+
+    def _run(self):
+        while True:
+            self._active.wait()
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, samples in self._samples.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[_collapse(frame)] += 1
+            time.sleep(self.interval_s)
+
+
+def _collapse(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+
+def write_folded(samples, path):
+    with open(path, 'w') as f:
+        for stack, count in samples.most_common():
+            f.write(f'{stack} {count}\n')
+
+
+def init_profiler(app):
+    """PROFILE_SLOW_MS दिइएमा मात्र before/after_request hooks दर्ता हुन्छन्।"""
+    slow_ms = app.config.get('PROFILE_SLOW_MS')
+    if not slow_ms:
+        return
+    folder = app.config['PROFILE_FOLDER']
+    os.makedirs(folder, exist_ok=True)
+    profiler = SamplingProfiler(app.config.get('PROFILE_INTERVAL_MS', 5) / 1000)
+
+    @app.before_request
+    def _start_sampling():
+        g.profile_thread = threading.get_ident()
+        g.profile_started = time.perf_counter()
+        profiler.start(g.profile_thread)
+
+    # teardown: exception भए पनि sampling रोकिन्छ
+    @app.teardown_request
+    def _dump_slow_request(exc):
+        thread_id = g.pop('profile_thread', None)
+        if thread_id is None:
+            return
+        samples = profiler.stop(thread_id)
+        elapsed_ms = (time.perf_counter() - g.pop('profile_started')) * 1000
+        if elapsed_ms >= slow_ms and samples:
+            name = f"{time.strftime('%Y%m%dT%H%M%S')}_{int(elapsed_ms)}ms_{request.method}_{request.endpoint or 'unmatched'}_{thread_id}.folded"
+            write_folded(samples, os.path.join(folder, name))
+            print(f"Slow request {request.method} {request.path} took {elapsed_ms:.0f} ms; profile written to {name}")
@@ -0,0 +1,142 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from api.models.detection_model import Pothole, Waste
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+
+MODELS = {'pothole': Pothole, 'waste': Waste}
+# Response मा प्रयोग हुने key (पुरानो GET / response सँग मिल्ने)
+LIST_KEYS = {'pothole': 'potholes', 'waste': 'wastes'}
+
+
+def _parse_time(value, name):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be an ISO date or datetime, e.g. 2025-11-17 or 2025-11-17T13:00:00")
+
+
+def encode_cursor(positions):
+    """{'pothole': last_id, ...} लाई URL-safe opaque cursor मा बदल्छ।"""
+    raw = json.dumps(positions, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        positions = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(positions, dict) or not all(
+        key in MODELS and isinstance(value, int) for key, value in positions.items()
+    ):
+        raise ValueError('Invalid cursor')
+    return positions
+
+
+def parse_filters(args):
+    """
+    Query string (type, status, category, since, until, limit, cursor) validate गर्छ।
+    गलत मान भए ValueError उठाउँछ।
+    """
+    detection_type = args.get('type')
+    if detection_type and detection_type not in MODELS:
+        raise ValueError("'type' must be 'pothole' or 'waste'")
+
+    types = [detection_type] if detection_type else list(MODELS)
+    # Category waste मा मात्र हुन्छ
+    if args.get('category'):
+        if detection_type == 'pothole':
+            raise ValueError("'category' only applies to waste detections")
+        types = ['waste']
+
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("'limit' must be an integer")
+        if limit < 1:
+            raise ValueError("'limit' must be positive")
+
+    filters = {
+        'types': types,
+        'status': args.get('status'),
+        'category': args.get('category'),
+        'since': _parse_time(args['since'], 'since') if args.get('since') else None,
+        'until': _parse_time(args['until'], 'until') if args.get('until') else None,
+        'limit': limit,
+        'cursor': decode_cursor(args['cursor']) if args.get('cursor') else None
+    }
+    if filters['cursor'] is not None:
+        # Cursor मा नभएका types को सबै rows पहिले नै पठाइसकिएको छ
+        filters['types'] = [t for t in types if t in filters['cursor']]
+    return filters
+
+
+def filtered_query(detection_type, filters):
+    """Filter हरू SQL मै लागू गरिएको, नयाँबाट पुरानो (id DESC) क्रमको query।"""
+    model = MODELS[detection_type]
+    query = model.query
+
+    if filters['status']:
+        status_column = model.status if detection_type == 'pothole' else model.detection_status
+        query = query.filter(status_column == filters['status'])
+    if filters['category'] and detection_type == 'waste':
+        query = query.filter(model.waste_category == filters['category'])
+    if filters['since']:
+        query = query.filter(model.timestamp >= filters['since'])
+    if filters['until']:
+        query = query.filter(model.timestamp < filters['until'])
+
+    return query.order_by(model.id.desc())
+
+
+def fetch_page(filters):
+    """
+    Keyset pagination: प्रत्येक type को लागि `limit` वटा rows र अर्को पेजको cursor।
+    ({'potholes': [...], 'wastes': [...]}, next_cursor) फर्काउँछ।
+    """
+    limit = min(filters['limit'] or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    page, positions = {}, {}
+
+    for detection_type in filters['types']:
+        model = MODELS[detection_type]
+        query = filtered_query(detection_type, filters)
+        if filters['cursor'] is not None:
+            query = query.filter(model.id < filters['cursor'][detection_type])
+
+        rows = query.limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            positions[detection_type] = rows[-1].id
+        page[LIST_KEYS[detection_type]] = [row.to_dict() for row in rows]
+
+    return page, encode_cursor(positions) if positions else None
+
+
+def iter_rows(filters):
+    """
+    NDJSON streaming का लागि server-side cursor बाट एक-एक row serialize गर्छ;
+    पूरै table memory मा लोड हुँदैन।
+    """
+    remaining = filters['limit']
+    for detection_type in filters['types']:
+        model = MODELS[detection_type]
+        query = filtered_query(detection_type, filters)
+        if filters['cursor'] is not None:
+            query = query.filter(model.id < filters['cursor'][detection_type])
+        if remaining is not None:
+            query = query.limit(remaining)
+
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            yield json.dumps({'type': detection_type, **row.to_dict()}) + '\n'
+            if remaining is not None:
+                remaining -= 1
+        if remaining is not None and remaining <= 0:
+            return
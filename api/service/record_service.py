@@ -0,0 +1,60 @@
+from flask import current_app
+from database import db
+from api.service.metrics import span
+from api.service.write_buffer import get_write_buffer
+from api.models.detection_model import Pothole, Waste
+
+
+def build_detection_record(detection_type, result_data, location, latitude, longitude):
+    """
+    Service को result बाट Pothole/Waste DB record बनाउँछ (session मा थपिँदैन)।
+    अमान्य detection_type भए None फर्काउँछ।
+    """
+    if detection_type == 'pothole':
+        return Pothole(
+            image_name=result_data['image_name'], # storage key (content-hash नाम), absolute path होइन
+            detected_image_path=result_data['detected_image_path'],
+            location=location,
+            latitude=latitude,
+            longitude=longitude,
+            status=result_data.get('status', 'pending'),
+            content_hash=result_data.get('content_hash'),
+            perceptual_hash=result_data.get('perceptual_hash')
+        )
+    elif detection_type == 'waste':
+        return Waste(
+            image_name=result_data['image_name'], # सुरक्षित नामको आवश्यकता छैन
+            detected_image_path=result_data['detected_image_path'],
+            location=location,
+            latitude=latitude,
+            longitude=longitude,
+            detection_status=result_data.get('detection_status', 'pending'),
+            is_waste=result_data.get('is_waste', False),
+            waste_category=result_data.get('waste_category', ''),
+            is_recyclable=result_data.get('is_recyclable', False),
+            is_decomposable=result_data.get('is_decomposable', False),
+            content_hash=result_data.get('content_hash'),
+            perceptual_hash=result_data.get('perceptual_hash')
+        )
+    return None
+
+
+def save_detection_record(detection_type, result_data, location, latitude, longitude):
+    """
+    Record बनाएर DB मा commit गर्छ। HTTP request र async worker दुवैले प्रयोग गर्छन्।
+    WRITE_BEHIND सक्रिय भए अरू requests का records सँगै एउटै transaction मा commit हुन्छ
+    (commit भएपछि मात्र फर्किन्छ; फर्काइएको record session बाट detached हुन्छ)।
+    """
+    record = build_detection_record(detection_type, result_data, location, latitude, longitude)
+    if record is None:
+        return None
+
+    buffer = get_write_buffer(current_app._get_current_object())
+    if buffer is not None:
+        with span('db_commit'):
+            return buffer.save(record)
+
+    db.session.add(record)
+    with span('db_commit'):
+        db.session.commit()
+    return record
@@ -0,0 +1,90 @@
+import math
+from sqlalchemy import and_, or_
+from api.service.geo import bbox_around, covering_cells, haversine_m
+from api.service.query_service import MODELS
+
+MAX_RESULTS = 1000
+# Nearest-K खोज यति radius सम्म मात्र फैलिन्छ
+NEAREST_START_RADIUS_M = 250
+NEAREST_MAX_RADIUS_M = 50000
+# हरेक ring मा प्रति type बढीमा k x यति candidates (नजिकबाटै क्रमबद्ध) DB बाट ल्याइन्छ
+NEAREST_CANDIDATES_PER_K = 4
+
+
+def _in_cells(model, cells):
+    # प्रत्येक geohash prefix B-tree index मा range scan हुन्छ ('~' सबै base32 अक्षरभन्दा ठूलो)
+    return or_(*[and_(model.geohash >= cell, model.geohash < cell + '~') for cell in cells])
+
+
+def within_bbox(types, min_lat, min_lon, max_lat, max_lon, limit=MAX_RESULTS, criteria=None):
+    """
+    Bounding box भित्रका detections: [(type, record), ...]।
+    `criteria(detection_type, model)` ले थप SQL conditions फर्काउन सक्छ।
+    """
+    cells = covering_cells(min_lat, min_lon, max_lat, max_lon)
+    matches = []
+    for detection_type in types:
+        model = MODELS[detection_type]
+        query = model.query.filter(
+            _in_cells(model, cells),
+            model.latitude.between(min_lat, max_lat),
+            model.longitude.between(min_lon, max_lon),
+            *(criteria(detection_type, model) if criteria else ())
+        ).order_by(model.id.desc()).limit(limit)
+        matches.extend((detection_type, record) for record in query)
+    return matches[:limit]
+
+
+def within_radius(types, latitude, longitude, radius_m, limit=MAX_RESULTS, criteria=None):
+    """
+    बिन्दुबाट `radius_m` metres भित्रका detections, नजिकबाट टाढाको क्रममा:
+    [(type, record, distance_m), ...]।
+    """
+    # Bbox ले index बाट candidates ल्याउँछ, त्यसपछि ठ्याक्कै दूरीले छान्ने
+    candidates = within_bbox(
+        types, *bbox_around(latitude, longitude, radius_m), limit=None, criteria=criteria
+    )
+    matches = []
+    for detection_type, record in candidates:
+        distance = haversine_m(latitude, longitude, record.latitude, record.longitude)
+        if distance <= radius_m:
+            matches.append((detection_type, record, distance))
+    matches.sort(key=lambda match: match[2])
+    return matches[:limit]
+
+
+def _closest_first(model, latitude, longitude):
+    # Equirectangular दूरीको वर्ग: SQL मै नजिकबाट क्रम मिलाउन (sqrt/trig नचाहिने)
+    lon_scale = math.cos(math.radians(latitude)) ** 2
+    d_lat = model.latitude - latitude
+    d_lon = model.longitude - longitude
+    return d_lat * d_lat + d_lon * d_lon * lon_scale
+
+
+def nearest(types, latitude, longitude, k, max_radius_m=NEAREST_MAX_RADIUS_M):
+    """
+    नजिकका K detections: radius दोब्बर गर्दै K भेटिएसम्म (वा `max_radius_m` सम्म) खोज्छ।
+    हरेक ring मा प्रति type नजिकबाट क्रमबद्ध k x NEAREST_CANDIDATES_PER_K candidates मात्र
+    ल्याइन्छ, त्यसैले घना क्षेत्रमा ठूलो radius ले पनि हजारौं rows पढ्दैन।
+    """
+    candidate_limit = max(1, k) * NEAREST_CANDIDATES_PER_K
+    radius = min(NEAREST_START_RADIUS_M, max_radius_m)
+    while True:
+        min_lat, min_lon, max_lat, max_lon = bbox_around(latitude, longitude, radius)
+        cells = covering_cells(min_lat, min_lon, max_lat, max_lon)
+        matches = []
+        for detection_type in types:
+            model = MODELS[detection_type]
+            query = model.query.filter(
+                _in_cells(model, cells),
+                model.latitude.between(min_lat, max_lat),
+                model.longitude.between(min_lon, max_lon)
+            ).order_by(_closest_first(model, latitude, longitude)).limit(candidate_limit)
+            for record in query:
+                distance = haversine_m(latitude, longitude, record.latitude, record.longitude)
+                if distance <= radius:
+                    matches.append((detection_type, record, distance))
+        if len(matches) >= k or radius >= max_radius_m:
+            matches.sort(key=lambda match: match[2])
+            return matches[:k]
+        radius = min(radius * 2, max_radius_m)
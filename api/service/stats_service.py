@@ -0,0 +1,181 @@
+from datetime import datetime
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from database import db
+from api.models.detection_model import DetectionStat, Pothole, Waste
+from api.service.geo import geohash_encode
+
+MODELS = {'pothole': Pothole, 'waste': Waste}
+TYPES = {Pothole: 'pothole', Waste: 'waste'}
+
+# Dashboard को map grid (~5 km cells)
+STATS_GEOHASH_PRECISION = 5
+
+# Bucket निकाल्न चाहिने columns
+_FIELDS = (
+    'status', 'detection_status', 'waste_category', 'is_recyclable', 'is_decomposable',
+    'timestamp', 'location', 'latitude', 'longitude', 'report_count'
+)
+
+
+def _label(value):
+    if value is None or value == '':
+        return 'unknown'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)[:255]
+
+
+def _geohash_label(latitude, longitude):
+    # Session मा assign गरिएका raw मानहरू (जस्तै JSON string "27.75") पनि आउन सक्छन्
+    try:
+        latitude = float(latitude) if latitude is not None else None
+        longitude = float(longitude) if longitude is not None else None
+    except (TypeError, ValueError):
+        return 'unknown'
+    return _label(geohash_encode(latitude, longitude, STATS_GEOHASH_PRECISION))
+
+
+def stat_buckets(detection_type, values):
+    """एउटा detection कुन-कुन (dimension, bucket) मा गनिन्छ।"""
+    timestamp = values.get('timestamp') or datetime.utcnow()
+    buckets = [
+        ('all', 'total'),
+        ('day', timestamp.strftime('%Y-%m-%d')),
+        ('location', _label(values.get('location'))),
+        ('geohash', _geohash_label(values.get('latitude'), values.get('longitude')))
+    ]
+    if detection_type == 'pothole':
+        buckets.append(('status', _label(values.get('status'))))
+    else:
+        buckets += [
+            ('status', _label(values.get('detection_status'))),
+            ('category', _label(values.get('waste_category'))),
+            ('recyclable', _label(values.get('is_recyclable'))),
+            ('decomposable', _label(values.get('is_decomposable')))
+        ]
+    return buckets
+
+
+def _current_values(record):
+    return {field: getattr(record, field, None) for field in _FIELDS}
+
+
+def _previous_values(record):
+    """Flush अघि DB मा रहेका (पुराना) मानहरू, attribute history बाट।"""
+    state = inspect(record)
+    values = {}
+    for field in _FIELDS:
+        if field not in state.mapper.column_attrs:
+            continue
+        history = state.attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        else:
+            values[field] = getattr(record, field)
+    return values
+
+
+def _add(deltas, detection_type, values, sign):
+    reports = values.get('report_count') or 1
+    for dimension, bucket in stat_buckets(detection_type, values):
+        key = (detection_type, dimension, bucket)
+        count, report_total = deltas.get(key, (0, 0))
+        deltas[key] = (count + sign, report_total + sign * reports)
+
+
+def apply_deltas(connection, deltas):
+    """
+    {(type, dimension, bucket): (count_delta, reports_delta)} लाई upsert गर्छ।
+    PostgreSQL र SQLite मा INSERT ... ON CONFLICT DO UPDATE (concurrent-safe)।
+    """
+    table = DetectionStat.__table__
+    dialect = connection.dialect.name
+    for (detection_type, dimension, bucket), (count, reports) in deltas.items():
+        if not count and not reports:
+            continue
+        if dialect in ('postgresql', 'sqlite'):
+            insert = (postgresql if dialect == 'postgresql' else sqlite).insert(table).values(
+                detection_type=detection_type, dimension=dimension, bucket=bucket, count=count, reports=reports
+            )
+            connection.execute(insert.on_conflict_do_update(
+                index_elements=['detection_type', 'dimension', 'bucket'],
+                set_={'count': table.c.count + count, 'reports': table.c.reports + reports}
+            ))
+            continue
+
+        where = (table.c.detection_type == detection_type) & (table.c.dimension == dimension) & (table.c.bucket == bucket)
+        updated = connection.execute(table.update().where(where).values(
+            count=table.c.count + count, reports=table.c.reports + reports
+        ))
+        if updated.rowcount == 0:
+            connection.execute(table.insert().values(
+                detection_type=detection_type, dimension=dimension, bucket=bucket, count=count, reports=reports
+            ))
+
+
+def _before_flush(session, flush_context, instances):
+    # Pothole/Waste को insert/update/delete सँगै उही transaction मा rollups मिलाउने
+    deltas = {}
+    for record in session.new:
+        if type(record) in TYPES:
+            _add(deltas, TYPES[type(record)], _current_values(record), +1)
+    for record in session.deleted:
+        if type(record) in TYPES:
+            _add(deltas, TYPES[type(record)], _previous_values(record), -1)
+    for record in session.dirty:
+        if type(record) in TYPES and session.is_modified(record, include_collections=False):
+            _add(deltas, TYPES[type(record)], _previous_values(record), -1)
+            _add(deltas, TYPES[type(record)], _current_values(record), +1)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def init_stats():
+    """Session events दर्ता गर्छ (create_app बाट; एक पटक मात्र)।"""
+    if not event.contains(Session, 'before_flush', _before_flush):
+        event.listen(Session, 'before_flush', _before_flush)
+
+
+def record_merged_report(record, added=1):
+    """
+    merge_report ले SQL UPDATE ले report_count बढाउँछ (ORM flush बाहिर), त्यसैले
+    reports rollup यहाँ छुट्टै बढाइन्छ।
+    """
+    deltas = {}
+    for dimension, bucket in stat_buckets(TYPES[type(record)], _current_values(record)):
+        deltas[(TYPES[type(record)], dimension, bucket)] = (0, added)
+    apply_deltas(db.session.connection(), deltas)
+
+
+def get_stats(detection_type=None, dimension=None):
+    """{type: {dimension: {bucket: {'count', 'reports'}}}} — rows होइन, buckets मात्र पढिन्छ।"""
+    query = DetectionStat.query.filter(DetectionStat.count > 0)
+    if detection_type:
+        query = query.filter(DetectionStat.detection_type == detection_type)
+    if dimension:
+        query = query.filter(DetectionStat.dimension == dimension)
+
+    stats = {}
+    for row in query.order_by(DetectionStat.detection_type, DetectionStat.dimension, DetectionStat.bucket):
+        stats.setdefault(row.detection_type, {}).setdefault(row.dimension, {})[row.bucket] = {
+            'count': row.count,
+            'reports': row.reports
+        }
+    return stats
+
+
+def rebuild_stats(batch_size=1000):
+    """Rollup table पूरै मेटाएर detections tables बाट फेरि गणना गर्छ; {type: count} फर्काउँछ।"""
+    DetectionStat.query.delete()
+    deltas = {}
+    for detection_type, model in MODELS.items():
+        columns = [getattr(model, field) for field in _FIELDS if hasattr(model, field)]
+        for row in db.session.query(*columns).yield_per(batch_size):
+            _add(deltas, detection_type, row._asdict(), +1)
+    apply_deltas(db.session.connection(), deltas)
+    db.session.commit()
+    return {key[0]: value[0] for key, value in deltas.items() if key[1] == 'all'}
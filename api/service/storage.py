@@ -0,0 +1,180 @@
+import hashlib
+import os
+import threading
+from abc import ABC, abstractmethod
+from flask import current_app
+
+
+class StorageError(RuntimeError):
+    """Storage backend मा पढ्न/लेख्न नसकेमा उठाइन्छ।"""
+
+
+def content_key(prefix, data, ext):
+    """
+    Content-hash मा आधारित relative key: `<prefix>/ab/cd/<sha256><ext>`। उही bytes सधैं उही
+    key पाउँछन् (overwrite हुँदैन) र पहिला दुई hash-prefix ले directory हरू सानो राख्छन्।
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    return f'{prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext.lower()}'
+
+
+class Storage(ABC):
+    """
+    Storage backend interface। DB मा यिनै relative keys राखिन्छन्, त्यसैले धेरै nodes ले
+    एउटै store बाँड्न सक्छन्। save/read/exists/delete नभएको backend instantiate नै हुँदैन।
+    """
+
+    @abstractmethod
+    def save(self, key, data):
+        """`data` लाई `key` मा लेखेर key फर्काउँछ।"""
+
+    @abstractmethod
+    def read(self, key):
+        """Key को bytes; नभए None।"""
+
+    @abstractmethod
+    def exists(self, key):
+        """Key भएमा True।"""
+
+    @abstractmethod
+    def delete(self, key):
+        """Key भए हटाउँछ (नभए केही गर्दैन)।"""
+
+    def local_path(self, key):
+        """Key disk मा सिधै पढ्न मिल्ने path भए त्यो (sendfile का लागि), नत्र None।"""
+        return None
+
+
+class LocalStorage(Storage):
+    """`root` मुनि फाइलहरू; लेखाइ tmp फाइल + fsync + os.replace ले atomic।"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get('STORAGE_ROOT') or config['UPLOAD_FOLDER'])
+
+    def _path(self, key):
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise StorageError(f'Invalid storage key: {key}')
+        return path
+
+    def save(self, key, data):
+        path = self._path(key)
+        if os.path.exists(path):
+            # Content-addressed key: उही bytes पहिले नै छन्
+            return key
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise StorageError(f'Could not write {key}: {e}') from e
+        return key
+
+    def read(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, key):
+        return os.path.isfile(self._path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, key):
+        return self._path(key)
+
+
+class S3Storage(Storage):
+    """
+    S3-compatible object store (AWS S3, वा local मा MinIO जस्तो stand-in)। boto3 optional
+    dependency हो र यो backend छानिँदा मात्र import हुन्छ; credentials boto3 को आफ्नै
+    environment variables बाट आउँछन्। PUT object आफैं atomic हुन्छ।
+    """
+
+    def __init__(self, bucket, endpoint_url=None, prefix=''):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise StorageError('STORAGE_BACKEND=s3 requires boto3 (pip install boto3)') from e
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self._client = boto3.client('s3', endpoint_url=endpoint_url)
+        self._client_error = ClientError
+
+    @classmethod
+    def from_config(cls, config):
+        if not config.get('S3_BUCKET'):
+            raise StorageError('STORAGE_BACKEND=s3 requires S3_BUCKET')
+        return cls(config['S3_BUCKET'], config.get('S3_ENDPOINT_URL'), config.get('S3_PREFIX', ''))
+
+    def _object_key(self, key):
+        return f'{self.prefix}/{key}' if self.prefix else key
+
+    def save(self, key, data):
+        try:
+            self._client.put_object(Bucket=self.bucket, Key=self._object_key(key), Body=data)
+        except self._client_error as e:
+            raise StorageError(f'Could not write {key}: {e}') from e
+        return key
+
+    def read(self, key):
+        try:
+            return self._client.get_object(Bucket=self.bucket, Key=self._object_key(key))['Body'].read()
+        except self._client_error as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None
+            raise StorageError(f'Could not read {key}: {e}') from e
+
+    def exists(self, key):
+        try:
+            self._client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except self._client_error:
+            return False
+
+    def delete(self, key):
+        self._client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+
+# नयाँ backend: register_backend('name', Class) — Class.from_config(app.config) चाहिन्छ
+STORAGE_BACKENDS = {
+    'local': LocalStorage,
+    's3': S3Storage
+}
+
+_STORAGE = None
+_STORAGE_LOCK = threading.Lock()
+
+
+def register_backend(name, backend_cls):
+    STORAGE_BACKENDS[name] = backend_cls
+
+
+def get_storage():
+    """STORAGE_BACKEND config अनुसारको backend (process भरि एउटै instance)।"""
+    global _STORAGE
+    if _STORAGE is None:
+        with _STORAGE_LOCK:
+            if _STORAGE is None:
+                name = current_app.config.get('STORAGE_BACKEND', 'local')
+                if name not in STORAGE_BACKENDS:
+                    raise StorageError(f'Unknown STORAGE_BACKEND {name!r}; expected one of {sorted(STORAGE_BACKENDS)}')
+                _STORAGE = STORAGE_BACKENDS[name].from_config(current_app.config)
+    return _STORAGE
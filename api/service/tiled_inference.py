@@ -0,0 +1,164 @@
+import numpy as np
+from api.service.metrics import Histogram
+
+# Adaptive (tiled) inference का per-model parameters। tile_size र roi_pad मूल (full-res)
+# pixels मा; हरेक tile मोडलको तालिमकै imgsz मा resize हुन्छ। TILING_PARAMS env (JSON) ले
+# यिनलाई override गर्न सकिन्छ, जस्तै {"pothole": {"tile_size": 960, "max_tiles": 4}}
+TILING_DEFAULTS = {
+    'pothole': {
+        'roi_conf': 0.15,    # सस्तो low-res pass मा candidate मान्ने न्यूनतम confidence
+        'tile_size': 1280,   # ROI tile को साइज (imgsz 640 को दुई गुणा resolution)
+        'overlap': 0.2,      # छिमेकी tiles बीचको overlap (tile_size को अंश)
+        'roi_pad': 0.5,      # Candidate box वरिपरि थपिने context (box को ठूलो side को अंश)
+        'max_tiles': 8,      # एउटा image मा बढीमा कति tiles
+        'min_scale': 2.0,    # Image को लामो side imgsz को यति गुणा भन्दा सानो भए tiling नगर्ने
+        'nms_iou': 0.5,      # Cross-tile NMS को IoU threshold
+        'edge_margin': 2     # Tile को भित्री किनार छोएका (काटिएका) boxes हटाउने margin (px)
+    },
+    'waste': {
+        'roi_conf': 0.15,
+        'tile_size': 640,
+        'overlap': 0.2,
+        'roi_pad': 0.5,
+        'max_tiles': 6,
+        'min_scale': 2.0,
+        'nms_iou': 0.5,
+        'edge_margin': 2
+    }
+}
+
+TILES_PER_IMAGE = Histogram(
+    'detection_tiles_per_image', 'High-resolution tiles run per image in adaptive mode.', ('model',),
+    buckets=(0, 1, 2, 4, 6, 8, 12, 16)
+)
+
+
+def tiling_params(name, overrides=None):
+    params = dict(TILING_DEFAULTS[name])
+    params.update((overrides or {}).get(name, {}))
+    return params
+
+
+def _numpy(values):
+    return values.cpu().numpy() if hasattr(values, 'cpu') else np.asarray(values)
+
+
+def result_boxes(result):
+    """Result बाट (xyxy (N,4), conf (N,), cls (N,)) NumPy arrays।"""
+    boxes = result.boxes
+    return (
+        _numpy(boxes.xyxy).reshape(-1, 4).astype(np.float32),
+        _numpy(boxes.conf).reshape(-1).astype(np.float32),
+        _numpy(boxes.cls).reshape(-1).astype(np.float32)
+    )
+
+
+def nms(xyxy, scores, classes, iou_threshold):
+    """Class-aware greedy NMS; राखिने indices (score घट्दो क्रममा)।"""
+    if len(scores) == 0:
+        return np.zeros(0, dtype=int)
+    # Class अनुसार boxes अलग गर्न offset (एउटै NMS loop ले सबै class)
+    offset = classes[:, None] * (xyxy.max() + 1)
+    boxes = xyxy + offset
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        x1 = np.maximum(boxes[i, 0], boxes[order[1:], 0])
+        y1 = np.maximum(boxes[i, 1], boxes[order[1:], 1])
+        x2 = np.minimum(boxes[i, 2], boxes[order[1:], 2])
+        y2 = np.minimum(boxes[i, 3], boxes[order[1:], 3])
+        inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+        iou = inter / (areas[i] + areas[order[1:]] - inter + 1e-9)
+        order = order[1:][iou <= iou_threshold]
+    return np.asarray(keep, dtype=int)
+
+
+def _axis_tiles(start, stop, size, step, limit):
+    """[start, stop) region लाई ढाक्ने tile सुरुवातहरू, image [0, limit) भित्र।"""
+    if stop - start <= size:
+        center = (start + stop) / 2
+        return [int(min(max(center - size / 2, 0), limit - size))]
+    positions = list(range(int(start), int(stop - size), step)) + [int(stop - size)]
+    return [min(max(p, 0), limit - size) for p in positions]
+
+
+def roi_tiles(candidates, scores, shape, params):
+    """
+    Candidate boxes (full-res) वरिपरि padding सहितका regions ढाक्ने (x0, y0, x1, y1) tiles।
+    उच्च score भएका candidates पहिले; max_tiles सम्म मात्र।
+    """
+    height, width = shape[:2]
+    size_x, size_y = min(params['tile_size'], width), min(params['tile_size'], height)
+    step_x = max(1, int(size_x * (1 - params['overlap'])))
+    step_y = max(1, int(size_y * (1 - params['overlap'])))
+
+    tiles = []
+    for i in scores.argsort()[::-1]:
+        x1, y1, x2, y2 = candidates[i]
+        pad = params['roi_pad'] * max(x2 - x1, y2 - y1)
+        region = (max(0, x1 - pad), max(0, y1 - pad), min(width, x2 + pad), min(height, y2 + pad))
+        for y0 in _axis_tiles(region[1], region[3], size_y, step_y, height):
+            for x0 in _axis_tiles(region[0], region[2], size_x, step_x, width):
+                tile = (x0, y0, x0 + size_x, y0 + size_y)
+                if tile not in tiles:
+                    tiles.append(tile)
+                if len(tiles) >= params['max_tiles']:
+                    return tiles
+    return tiles
+
+
+def _with_boxes(result, data):
+    """उही orig_img (shared frame) मा नयाँ boxes भएको Result (torch भए torch tensor नै)।"""
+    original = result.boxes.data
+    if type(original).__module__.startswith('torch'):
+        import torch
+        data = torch.as_tensor(data, dtype=original.dtype, device=original.device)
+    merged = result.new()
+    merged.update(boxes=data)
+    return merged
+
+
+def adaptive_predict(name, model, frame, shared, imgsz, params, conf):
+    """
+    1) `shared` (low-res) मा कम confidence सहित सस्तो pass, 2) candidates भएका regions मात्र
+    full-res `frame` बाट tiles काटेर imgsz मा फेरि predict, 3) coarse र tile boxes लाई
+    cross-tile NMS ले merge। Boxes `shared` को coordinates मा भएको Result फर्काउँछ।
+    """
+    predict_kwargs = {'imgsz': imgsz, 'save': False, 'verbose': False}
+    coarse = model.predict(source=shared, conf=min(params['roi_conf'], conf), **predict_kwargs)[0]
+    xyxy, scores, classes = result_boxes(coarse)
+
+    scale = max(frame.shape[:2]) / max(shared.shape[:2])
+    confident = scores >= conf
+    # Tiles roi_conf भन्दा माथिका candidates बाट मात्र (conf धेरै कम दिइए पनि, जस्तै mAP evaluation)
+    candidates = scores >= params['roi_conf']
+    if not candidates.any() or max(frame.shape[:2]) < imgsz * params['min_scale']:
+        TILES_PER_IMAGE.observe(0, model=name)
+        return _with_boxes(coarse, np.column_stack([xyxy, scores, classes])[confident])
+
+    tiles = roi_tiles(xyxy[candidates] * scale, scores[candidates], frame.shape, params)
+    TILES_PER_IMAGE.observe(len(tiles), model=name)
+    crops = [frame[y0:y1, x0:x1] for x0, y0, x1, y1 in tiles]
+    tile_results = model.predict(source=crops, conf=conf, **predict_kwargs)
+
+    height, width = frame.shape[:2]
+    margin = params['edge_margin']
+    merged = [np.column_stack([xyxy, scores, classes])[confident]]
+    for (x0, y0, x1, y1), tile_result in zip(tiles, tile_results):
+        t_xyxy, t_scores, t_classes = result_boxes(tile_result)
+        if not len(t_scores):
+            continue
+        t_xyxy = t_xyxy + np.array([x0, y0, x0, y0], dtype=np.float32)
+        # Image को किनार बाहेक tile को भित्री किनारमा काटिएका boxes: छिमेकी tile/coarse ले ढाक्छ
+        cut = (
+            ((t_xyxy[:, 0] <= x0 + margin) & (x0 > 0)) | ((t_xyxy[:, 1] <= y0 + margin) & (y0 > 0)) |
+            ((t_xyxy[:, 2] >= x1 - margin) & (x1 < width)) | ((t_xyxy[:, 3] >= y1 - margin) & (y1 < height))
+        )
+        merged.append(np.column_stack([t_xyxy[~cut] / scale, t_scores[~cut], t_classes[~cut]]))
+
+    merged = np.concatenate(merged).astype(np.float32)
+    keep = nms(merged[:, :4], merged[:, 4], merged[:, 5], params['nms_iou'])
+    return _with_boxes(coarse, merged[keep])
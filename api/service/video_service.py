@@ -0,0 +1,251 @@
+import bisect
+import csv
+import json
+import os
+import time
+import cv2
+import numpy as np
+from flask import current_app
+from database import db
+from api.service.detection_service import classify_frames, save_detection_images
+from api.service.geo import haversine_m
+from api.service.ingest_service import CREATED, MERGED
+from api.service.merge_service import find_open_detection, merge_report
+from api.service.record_service import build_detection_record
+
+DEFAULT_FPS = 30.0
+# Motion gating को लागि सानो grayscale thumbnail
+MOTION_SIZE = (64, 36)
+
+
+class GpsTrack(list):
+    """समय अनुसार क्रमबद्ध [(t, lat, lon), ...]; bisect का लागि times पहिल्यै निकालिएको।"""
+
+    def __init__(self, points):
+        super().__init__(sorted(points))
+        self.times = [point[0] for point in self]
+
+
+def load_track(path):
+    """
+    GPS sidecar track: CSV (t,latitude,longitude — t = video सुरु भएदेखिका seconds) वा
+    त्यस्तै objects को JSON list। GpsTrack फर्काउँछ।
+    """
+    with open(path, encoding='utf-8-sig') as f:
+        if path.lower().endswith('.json'):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+
+    track = []
+    for row in rows:
+        try:
+            t = float(row.get('t', row.get('time')))
+            track.append((t, float(row.get('latitude', row.get('lat'))), float(row.get('longitude', row.get('lon')))))
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid GPS track row: {row}')
+    if not track:
+        raise ValueError('GPS track is empty')
+    return GpsTrack(track)
+
+
+def interpolate_position(track, t):
+    """Track बाट समय `t` को (lat, lon) linear interpolation ले निकाल्छ।"""
+    i = bisect.bisect_left(track.times, t)
+    if i <= 0:
+        return track[0][1], track[0][2]
+    if i >= len(track):
+        return track[-1][1], track[-1][2]
+    (t0, lat0, lon0), (t1, lat1, lon1) = track[i - 1], track[i]
+    ratio = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+    return lat0 + (lat1 - lat0) * ratio, lon0 + (lon1 - lon0) * ratio
+
+
+def iter_sampled_frames(video_path, track, stats, min_distance_m=5.0, min_interval_s=0.5, motion_threshold=4.0):
+    """
+    Video लाई streaming generator मा decode गर्छ र (t, frame, lat, lon) मात्र निकाल्छ:
+
+    - गाडी `min_distance_m` भन्दा कम सरेको भए (track नभए `min_interval_s` भन्दा कम समय) skip
+    - अघिल्लो sampled frame सँग दृश्य खासै नबदलिएको (mean abs diff < `motion_threshold`) भए skip
+
+    Skip हुने frames `grab()` ले मात्र अघि बढाइन्छ, BGR मा retrieve गरिँदैन।
+    """
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise ValueError(f'Cannot open video: {video_path}')
+    fps = capture.get(cv2.CAP_PROP_FPS) or DEFAULT_FPS
+
+    last_t, last_position, last_thumb = None, None, None
+    index = -1
+    try:
+        while capture.grab():
+            index += 1
+            stats['frames_total'] += 1
+            t = index / fps
+            position = interpolate_position(track, t) if track else (None, None)
+
+            # ---------- Speed / distance gating ----------
+            if last_t is not None:
+                if track:
+                    if haversine_m(*last_position, *position) < min_distance_m:
+                        stats['skipped_distance'] += 1
+                        continue
+                elif t - last_t < min_interval_s:
+                    stats['skipped_distance'] += 1
+                    continue
+
+            ok, frame = capture.retrieve()
+            if not ok:
+                break
+
+            # ---------- Motion gating ----------
+            thumb = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), MOTION_SIZE, interpolation=cv2.INTER_AREA)
+            if last_thumb is not None and float(np.mean(cv2.absdiff(thumb, last_thumb))) < motion_threshold:
+                stats['skipped_motion'] += 1
+                continue
+
+            last_t, last_position, last_thumb = t, position, thumb
+            stats['frames_sampled'] += 1
+            yield t, frame, position[0], position[1]
+    finally:
+        capture.release()
+    stats['duration_s'] = round((index + 1) / fps, 2)
+
+
+def _category(detection):
+    return detection['result_data'].get('waste_category')
+
+
+class _EventCollapser:
+    """
+    लगातारका sampled frames मा देखिएको उही वस्तुलाई एउटै event मा जोड्छ र सबैभन्दा
+    उच्च confidence भएको frame लाई प्रतिनिधि राख्छ।
+    """
+
+    def __init__(self, collapse_distance_m, max_gap):
+        self.collapse_distance_m = collapse_distance_m
+        self.max_gap = max_gap
+        self.open = {}  # (type, category) -> event
+
+    def add(self, detection):
+        """नयाँ detection थप्छ; बन्द भएका events फर्काउँछ।"""
+        key = (detection['type'], _category(detection))
+        closed = []
+        event = self.open.get(key)
+        if event is not None:
+            last = event['last_position']
+            position = (detection['latitude'], detection['longitude'])
+            near = None in last or None in position or haversine_m(*last, *position) <= self.collapse_distance_m
+            if near:
+                event['frames'] += 1
+                event['misses'] = 0
+                event['last_position'] = position
+                if detection['confidence'] > event['best']['confidence']:
+                    event['best'] = detection
+                return closed
+            closed.append(self.open.pop(key))
+        self.open[key] = {
+            'best': detection, 'frames': 1, 'misses': 0,
+            'last_position': (detection['latitude'], detection['longitude'])
+        }
+        return closed
+
+    def tick(self, seen_keys):
+        """यो sample मा नदेखिएका events को gap बढाउँछ; `max_gap` नाघेका बन्द गर्छ।"""
+        closed = []
+        for key in list(self.open):
+            if key in seen_keys:
+                continue
+            self.open[key]['misses'] += 1
+            if self.open[key]['misses'] > self.max_gap:
+                closed.append(self.open.pop(key))
+        return closed
+
+    def flush(self):
+        closed, self.open = list(self.open.values()), {}
+        return closed
+
+
+def _persist(events, video_name, location, summary):
+    for event in events:
+        best = event['best']
+        result_data = dict(best['result_data'])
+        existing = find_open_detection(best['type'], result_data, best['latitude'], best['longitude'])
+        if existing is not None:
+            merge_report(existing, commit=False)
+            summary[MERGED] += 1
+            continue
+
+        ok, encoded = cv2.imencode('.jpg', best['frame'])
+        filename = f"{os.path.splitext(os.path.basename(video_name))[0]}_{best['t']:.1f}s.jpg"
+        if not ok:
+            # Encode असफल भए गलत bytes storage मा नलेखी यो event छोड्ने
+            print(f'Could not encode frame {filename}; skipping detection')
+            summary['failed'] += 1
+            continue
+        result_data['image_name'], result_data['detected_image_path'] = save_detection_images(
+            best['type'], filename, encoded.tobytes(), best['result']
+        )
+        record = build_detection_record(best['type'], result_data, location, best['latitude'], best['longitude'])
+        db.session.add(record)
+        summary[CREATED] += 1
+    if events:
+        db.session.commit()
+
+
+def process_video(video_path, track_path=None, location=None, batch_size=8, video_name=None):
+    """
+    Dashcam video बाट sampled frames मा batched inference चलाएर, लगातारका उही वस्तुलाई
+    एउटै record मा collapse गरी DB मा बचत गर्छ। Summary dict फर्काउँछ।
+    """
+    config = current_app.config
+    track = load_track(track_path) if track_path else None
+    location = location or os.path.basename(video_name or video_path)
+    collapser = _EventCollapser(config.get('VIDEO_COLLAPSE_DISTANCE_M', 15.0), config.get('VIDEO_MAX_GAP_FRAMES', 2))
+
+    stats = {'frames_total': 0, 'frames_sampled': 0, 'skipped_distance': 0, 'skipped_motion': 0}
+    summary = {CREATED: 0, MERGED: 0, 'failed': 0}
+    started = time.perf_counter()
+
+    frames = iter_sampled_frames(
+        video_path, track, stats,
+        min_distance_m=config.get('VIDEO_MIN_DISTANCE_M', 5.0),
+        min_interval_s=config.get('VIDEO_MIN_INTERVAL_S', 0.5),
+        motion_threshold=config.get('VIDEO_MOTION_THRESHOLD', 4.0)
+    )
+
+    def run_batch(batch):
+        closed = []
+        for (t, frame, latitude, longitude), (detection_type, result, result_data) in zip(
+            batch, classify_frames([item[1] for item in batch])
+        ):
+            seen = set()
+            if detection_type:
+                detection = {
+                    'type': detection_type, 'result': result, 'result_data': result_data, 'frame': frame,
+                    't': t, 'latitude': latitude, 'longitude': longitude,
+                    'confidence': float(result.boxes.conf.max())
+                }
+                seen.add((detection_type, _category(detection)))
+                closed.extend(collapser.add(detection))
+            closed.extend(collapser.tick(seen))
+        _persist(closed, video_name or video_path, location, summary)
+
+    batch = []
+    for sample in frames:
+        batch.append(sample)
+        if len(batch) >= batch_size:
+            run_batch(batch)
+            batch = []
+    if batch:
+        run_batch(batch)
+    _persist(collapser.flush(), video_name or video_path, location, summary)
+
+    elapsed = time.perf_counter() - started
+    duration = stats.get('duration_s') or 0.0
+    return {
+        **stats,
+        'detections': summary,
+        'elapsed_s': round(elapsed, 2),
+        'realtime_factor': round(elapsed / duration, 3) if duration else None
+    }
@@ -0,0 +1,173 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from sqlalchemy.orm import Session
+from database import db
+from api.service.metrics import Histogram
+
+WRITE_BATCH_SIZE = Histogram(
+    'detection_write_batch_size', 'Detection rows committed per write-behind transaction.',
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+WRITE_FLUSH_SECONDS = Histogram(
+    'detection_write_flush_seconds', 'Time spent committing one write-behind batch.'
+)
+
+_STOP = object()
+
+
+class WriteBuffer:
+    """
+    नयाँ Pothole/Waste records लाई `max_delay_ms` सम्म वा `max_batch_size` वटा नपुगेसम्म जम्मा
+    गरेर एउटै transaction (multi-row INSERT) मा commit गर्छ। `submit` ले Future फर्काउँछ र
+    `save` commit भएपछि मात्र फर्किन्छ, त्यसैले response पठाइएको हरेक record DB मा durable हुन्छ;
+    request ले commit round-trip आफैं तिर्नुको सट्टा अरूसँग बाँड्छ (group commit)।
+    """
+
+    def __init__(self, app, max_batch_size=32, max_delay_ms=20):
+        self.app = app
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_delay = max(0.0, float(max_delay_ms)) / 1000.0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self.counters = {'records': 0, 'batches': 0, 'retried_batches': 0, 'failed': 0}
+
+    def submit(self, record):
+        """Transient record लाई queue मा राखेर Future फर्काउँछ (commit पछि record नै result)।"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Write buffer is closed')
+            self._ensure_worker()
+            self._queue.put((record, future))
+        return future
+
+    def save(self, record):
+        return self.submit(record).result()
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='write-buffer', daemon=True)
+            self._thread.start()
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        while True:
+            batch, stopping = self._collect()
+            if batch:
+                self._flush(batch)
+            if stopping:
+                # Shutdown: queue मा बाँकी सबै commit गरेर मात्र बाहिरिने
+                remaining = []
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        remaining.append(item)
+                for i in range(0, len(remaining), self.max_batch_size):
+                    self._flush(remaining[i:i + self.max_batch_size])
+                return
+
+    def _commit(self, records):
+        # expire_on_commit=False: commit पछि पनि attributes (id, timestamp) request ले पढ्न सकोस्
+        with Session(db.engine, expire_on_commit=False) as session:
+            session.add_all(records)
+            session.commit()
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+        failures = {}
+        with self.app.app_context():
+            try:
+                self._commit([record for record, _ in batch])
+            except Exception as e:
+                # एउटा खराब row ले अरूलाई नबिगारोस्: छुट्टाछुट्टै transaction मा फेरि प्रयास
+                print(f'Write batch of {len(batch)} failed, retrying row by row: {e}')
+                for index, (record, _) in enumerate(batch):
+                    try:
+                        self._commit([record])
+                    except Exception as row_error:
+                        failures[index] = row_error
+                with self._lock:
+                    self.counters['retried_batches'] += 1
+
+        WRITE_BATCH_SIZE.observe(len(batch))
+        WRITE_FLUSH_SECONDS.observe(time.perf_counter() - started)
+        with self._lock:
+            self.counters['batches'] += 1
+            self.counters['records'] += len(batch) - len(failures)
+            self.counters['failed'] += len(failures)
+
+        for index, (record, future) in enumerate(batch):
+            if index in failures:
+                future.set_exception(failures[index])
+            else:
+                future.set_result(record)
+
+    def close(self, timeout=30):
+        """नयाँ writes रोकेर queue मा भएका सबै commit गर्छ (atexit बाट पनि बोलाइन्छ)।"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self.counters,
+                'max_batch_size': self.max_batch_size,
+                'max_delay_ms': self.max_delay * 1000,
+                'queue_depth': self._queue.qsize(),
+                'avg_batch_size': round(self.counters['records'] / self.counters['batches'], 3)
+                if self.counters['batches'] else 0.0
+            }
+
+
+_BUFFER = None
+_BUFFER_LOCK = threading.Lock()
+
+
+def get_write_buffer(app):
+    """WRITE_BEHIND=1 भए process भरि एउटै buffer (shutdown मा flush हुने), नत्र None।"""
+    global _BUFFER
+    if _BUFFER is None and app.config.get('WRITE_BEHIND'):
+        with _BUFFER_LOCK:
+            if _BUFFER is None:
+                _BUFFER = WriteBuffer(
+                    app,
+                    app.config.get('WRITE_BEHIND_MAX_BATCH', 32),
+                    app.config.get('WRITE_BEHIND_MAX_DELAY_MS', 20)
+                )
+                atexit.register(_BUFFER.close)
+    return _BUFFER
+
+
+def write_buffer_stats():
+    return _BUFFER.stats() if _BUFFER is not None else None
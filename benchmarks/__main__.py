@@ -0,0 +1,68 @@
+"""
+Offline benchmark suite (network/Postgres चाहिँदैन):
+
+    python -m benchmarks                       # micro + load, table मात्र
+    python -m benchmarks adaptive --upscale 4  # standard बनाम tiled inference (accuracy/latency)
+    python -m benchmarks packed --split valid  # packed dataset मा mAP + per-image latency
+    python -m benchmarks --save baseline.json  # नतिजा baseline को रूपमा राख्ने
+    python -m benchmarks --compare baseline.json --threshold 0.1
+
+`--compare` ले p95 वा throughput threshold भन्दा बढी बिग्रिएमा exit code 1 दिन्छ।
+INFERENCE_BACKEND environment variable ले runtime छान्छ (pytorch/onnx/openvino ...)।
+"""
+import argparse
+import sys
+from benchmarks.report import compare, environment, peak_rss_mb, print_table, save_baseline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Detection latency/throughput benchmarks')
+    parser.add_argument('suites', nargs='*', metavar='{micro,load,adaptive,packed}', help='Suites to run (default: micro load).')
+    parser.add_argument('--model', dest='names', action='append', choices=['pothole', 'waste'], help='Only benchmark this model (repeatable).')
+    parser.add_argument('--limit', type=int, default=None, help='Use only the first N test images per dataset.')
+    parser.add_argument('--repeat', type=int, default=1, help='Repeat the micro-benchmark corpus N times.')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent clients in the load test.')
+    parser.add_argument('--get-requests', type=int, default=200, help='Requests per GET scenario.')
+    parser.add_argument('--write-behind', action='store_true', help='Load suite: group record inserts through the write-behind buffer.')
+    parser.add_argument('--upscale', type=float, default=1.0, help='Adaptive suite: upscale test images to mimic high-res photos.')
+    parser.add_argument('--split', default='test', choices=['train', 'valid', 'test'], help='Packed suite: dataset split to evaluate.')
+    parser.add_argument('--packed-root', default=None, help='Packed suite: folder written by `flask detections pack-datasets`.')
+    parser.add_argument('--save', metavar='PATH', help='Write results as a JSON baseline.')
+    parser.add_argument('--compare', metavar='PATH', help='Compare against a saved baseline.')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed relative regression (default 10%%).')
+    args = parser.parse_args(argv)
+    suites = args.suites or ['micro', 'load']
+    if set(suites) - {'micro', 'load', 'adaptive', 'packed'}:
+        parser.error('suites must be micro, load, adaptive and/or packed')
+
+    results = {'environment': environment()}
+    if 'micro' in suites:
+        from benchmarks.micro import run_micro
+        results['micro'] = run_micro(args.names, limit=args.limit, repeat=args.repeat)
+    if 'load' in suites:
+        from benchmarks.load import run_load
+        results['load'] = run_load(args.limit, args.concurrency, args.get_requests, write_behind=args.write_behind)
+    if 'adaptive' in suites:
+        from benchmarks.adaptive import run_adaptive
+        results['adaptive'] = run_adaptive(args.names, limit=args.limit, upscale=args.upscale)
+    if 'packed' in suites:
+        from benchmarks.packed import run_packed
+        results['packed'] = run_packed(args.names, split=args.split, root=args.packed_root, limit=args.limit)
+    results['peak_rss_mb'] = peak_rss_mb()
+
+    print_table(results)
+    if args.save:
+        save_baseline(results, args.save)
+        print(f'Baseline written to {args.save}')
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for scenario, metric, old, new in regressions:
+            print(f'REGRESSION {scenario} {metric}: {old} -> {new}')
+        if regressions:
+            return 1
+        print(f'No regressions beyond {args.threshold:.0%} against {args.compare}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
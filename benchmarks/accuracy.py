@@ -0,0 +1,78 @@
+import numpy as np
+
+# mAP पूरा PR curve बाट: predictions यति कम confidence मा लिइन्छन् (Ultralytics val जस्तै)।
+# Production CONFIDENCE मा filter गरेर निकालेको "mAP" curve काटिएको हुन्छ, तुलनायोग्य हुँदैन।
+MAP_CONFIDENCE = 0.001
+
+
+def _iou_matrix(a, b):
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def average_precision(recall, precision):
+    """All-point interpolated AP (VOC2010+/COCO जस्तै)।"""
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    precision = np.concatenate([[1.0], precision, [0.0]])
+    precision = np.flip(np.maximum.accumulate(np.flip(precision)))
+    changes = np.where(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[changes + 1] - recall[changes]) * precision[changes + 1]))
+
+
+def evaluate(samples, iou_threshold=0.5):
+    """
+    `samples`: [((pred_xyxy, pred_conf, pred_cls), (gt_xyxy, gt_cls)), ...] (normalized
+    coordinates)। mAP@iou_threshold, precision र recall फर्काउँछ।
+    """
+    detections = {}  # cls -> [(conf, is_true_positive)]
+    gt_counts = {}
+    for (p_xyxy, p_conf, p_cls), (g_xyxy, g_cls) in samples:
+        for cls in g_cls:
+            gt_counts[int(cls)] = gt_counts.get(int(cls), 0) + 1
+        ious = _iou_matrix(p_xyxy, g_xyxy) if len(p_xyxy) and len(g_xyxy) else np.zeros((len(p_xyxy), 0))
+        matched = set()
+        for i in np.argsort(-p_conf):
+            best, best_iou = None, iou_threshold
+            for j in range(len(g_cls)):
+                if j in matched or g_cls[j] != p_cls[i]:
+                    continue
+                if ious[i, j] >= best_iou:
+                    best, best_iou = j, ious[i, j]
+            if best is not None:
+                matched.add(best)
+            detections.setdefault(int(p_cls[i]), []).append((float(p_conf[i]), best is not None))
+
+    aps, true_positives, predicted = [], 0, 0
+    for cls, total in gt_counts.items():
+        ranked = sorted(detections.get(cls, []), key=lambda d: -d[0])
+        hits = np.cumsum([tp for _, tp in ranked]) if ranked else np.zeros(0)
+        recall = hits / total
+        precision = hits / np.arange(1, len(ranked) + 1) if ranked else np.zeros(0)
+        aps.append(average_precision(recall, precision))
+    for ranked in detections.values():
+        predicted += len(ranked)
+        true_positives += sum(tp for _, tp in ranked)
+    total_gt = sum(gt_counts.values())
+    return {
+        'map50' if iou_threshold == 0.5 else f'map{int(iou_threshold * 100)}': round(float(np.mean(aps)), 4) if aps else 0.0,
+        'precision': round(true_positives / predicted, 4) if predicted else 0.0,
+        'recall': round(true_positives / total_gt, 4) if total_gt else 0.0,
+        'ground_truth_boxes': total_gt,
+        'predicted_boxes': predicted
+    }
+
+
+def accuracy_metrics(map_samples, samples):
+    """
+    mAP50 `map_samples` (MAP_CONFIDENCE मा predict) बाट, precision/recall `samples`
+    (production CONFIDENCE मा predict) बाट।
+    """
+    metrics = evaluate(samples)
+    metrics['map50'] = evaluate(map_samples)['map50']
+    return metrics
@@ -0,0 +1,74 @@
+import time
+import cv2
+import numpy as np
+from api.service.inference_engine import CONFIDENCE, prepare_frame
+from api.service.model_export import dataset_images, load_labels
+from api.service.model_registry import MODEL_SPECS, load_model
+from api.service.tiled_inference import TILES_PER_IMAGE, adaptive_predict, result_boxes, tiling_params
+from benchmarks.accuracy import MAP_CONFIDENCE, accuracy_metrics
+from benchmarks.report import summarize
+
+
+def _normalized(result):
+    xyxy, conf, cls = result_boxes(result)
+    height, width = result.orig_shape[:2]
+    return xyxy / np.array([width, height, width, height], dtype=np.float32), conf, cls.astype(int)
+
+
+def run_adaptive(names=None, backend=None, limit=None, upscale=1.0, overrides=None):
+    """
+    हरेक मोडलको test split मा standard (shared frame मात्र) र adaptive (low-res pass + ROI
+    tiles) inference को latency र accuracy: precision/recall production conf मा, mAP50
+    MAP_CONFIDENCE मा चलाइएको छुट्टै pass बाट।
+
+    Dataset का तस्बिरहरू प्रायः imgsz कै साइजका हुन्छन्, जहाँ tiling लाग्दैन; `upscale` ले
+    ठूला phone/dashcam photos को साइज नक्कल गर्छ (नयाँ detail थपिँदैन, latency मात्र यथार्थ)।
+    """
+    results = {}
+    for name in names or sorted(MODEL_SPECS):
+        imgsz = MODEL_SPECS[name]['imgsz']
+        params = tiling_params(name, overrides)
+        model = load_model(name, backend)
+        paths = dataset_images(name, 'test', limit)
+        if not paths:
+            print(f'No test images for {name}; skipping')
+            continue
+
+        def frames():
+            # Upscaled frames ठूला हुन्छन्: memory मा सबै नराखी हरेक pass मा पढ्ने
+            for path in paths:
+                frame = cv2.imread(path)
+                if frame is None:
+                    continue
+                if upscale != 1.0:
+                    frame = cv2.resize(frame, None, fx=upscale, fy=upscale, interpolation=cv2.INTER_CUBIC)
+                yield frame, load_labels(path)
+
+        for mode in ('standard', 'adaptive'):
+            def predict(frame, conf):
+                shared = prepare_frame(frame)
+                if mode == 'adaptive':
+                    return adaptive_predict(name, model, frame, shared, imgsz, params, conf)
+                return model.predict(source=shared, imgsz=imgsz, conf=conf, save=False, verbose=False)[0]
+
+            # Timed pass production CONFIDENCE मा: latency, tiles र precision/recall
+            latencies, samples = [], []
+            tiles_before = TILES_PER_IMAGE.totals(model=name)[0]
+            started = time.perf_counter()
+            for frame, labels in frames():
+                t0 = time.perf_counter()
+                result = predict(frame, CONFIDENCE)
+                latencies.append((time.perf_counter() - t0) * 1000)
+                samples.append((_normalized(result), labels))
+            elapsed = time.perf_counter() - started
+            tiles = TILES_PER_IMAGE.totals(model=name)[0] - tiles_before
+
+            # mAP50 का लागि छुट्टै (untimed) pass, MAP_CONFIDENCE मा
+            map_samples = [(_normalized(predict(frame, MAP_CONFIDENCE)), labels) for frame, labels in frames()]
+
+            row = summarize(latencies, elapsed)
+            row.update(accuracy_metrics(map_samples, samples))
+            if mode == 'adaptive':
+                row['avg_tiles'] = round(tiles / max(1, len(latencies)), 2)
+            results[f'{name}.{mode}@{imgsz}'] = row
+    return results
@@ -0,0 +1,104 @@
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app import create_app
+from database import db
+from benchmarks.micro import load_corpus
+from benchmarks.report import summarize
+
+# Kathmandu वरिपरि ~111 m को grid: हरेक upload छुट्टै ठाउँमा (merge नहोस्)
+BASE_LATITUDE, BASE_LONGITUDE, GRID_STEP = 27.70, 85.30, 0.001
+
+
+def benchmark_app(workdir, write_behind=False):
+    """Local SQLite र temp folders सहितको create_app() (Postgres चाहिँदैन)।"""
+    app = create_app({
+        'WRITE_BEHIND': write_behind,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(workdir, 'bench.sqlite3'),
+        'SQLALCHEMY_ENGINE_OPTIONS': {'connect_args': {'timeout': 30, 'check_same_thread': False}},
+        'UPLOAD_FOLDER': os.path.join(workdir, 'uploads'),
+        'DETECTED_FOLDER': os.path.join(workdir, 'detected'),
+        'STORAGE_ROOT': os.path.join(workdir, 'uploads'),
+        'VARIANT_FOLDER': os.path.join(workdir, 'variants'),
+        'JOB_QUEUE_PATH': os.path.join(workdir, 'jobs.sqlite3'),
+        'JOB_FOLDER': os.path.join(workdir, 'uploads', 'jobs'),
+        'TESTING': True
+    })
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _run(client_call, requests, concurrency, rate_key):
+    def one(request):
+        t0 = time.perf_counter()
+        status = client_call(request)
+        return (time.perf_counter() - t0) * 1000, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, requests))
+    elapsed = time.perf_counter() - started
+
+    errors = sum(1 for _, status in outcomes if status >= 400)
+    return summarize([ms for ms, _ in outcomes], elapsed, errors=errors, rate_key=rate_key), outcomes
+
+
+def run_load(limit=None, concurrency=4, get_requests=200, workdir=None, write_behind=False):
+    """
+    POST /api/detections/ मा दुवै dataset का test तस्बिरहरू पठाएर, त्यसपछि GET endpoints
+    (list, nearby, stats, detail, thumbnail) मा end-to-end latency/throughput मापन गर्छ।
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix='smartcity-bench-')
+    app = benchmark_app(workdir, write_behind)
+    client = app.test_client()
+
+    corpus = load_corpus('pothole', limit) + load_corpus('waste', limit)
+    uploads = [
+        (os.path.basename(path), data, BASE_LATITUDE + (i // 100) * GRID_STEP, BASE_LONGITUDE + (i % 100) * GRID_STEP)
+        for i, (path, data) in enumerate(corpus)
+    ]
+
+    def post(upload):
+        filename, data, latitude, longitude = upload
+        response = client.post('/api/detections/', data={
+            'image': (io.BytesIO(data), filename),
+            'location': 'benchmark',
+            'latitude': str(latitude),
+            'longitude': str(longitude)
+        }, content_type='multipart/form-data')
+        if response.status_code == 201:
+            record = response.json['data']
+            created.append(('waste' if 'waste_category' in record else 'pothole', record['id']))
+        return response.status_code
+
+    created = []
+    results = {}
+    results['POST /'], _ = _run(post, uploads, concurrency, 'images_per_s')
+
+    detail_urls = []
+    for detection_type, record_id in created:
+        detail_urls.append(f'/api/detections/{detection_type}/{record_id}')
+    if not detail_urls:
+        print('No detections were created; detail/image scenarios skipped')
+
+    def get(url):
+        return client.get(url).status_code
+
+    scenarios = {
+        'GET / (page of 50)': ['/api/detections/?limit=50'],
+        'GET /nearby (500 m)': [
+            f'/api/detections/nearby?lat={BASE_LATITUDE + 0.002}&lon={BASE_LONGITUDE + 0.01}&radius=500'
+        ],
+        'GET /stats': ['/api/detections/stats'],
+        'GET /<type>/<id>': detail_urls,
+        'GET /<type>/<id>/image thumb': [url + '/image?size=thumb&format=webp' for url in detail_urls]
+    }
+    for name, urls in scenarios.items():
+        if not urls:
+            continue
+        requests = [urls[i % len(urls)] for i in range(get_requests)]
+        results[name], _ = _run(get, requests, concurrency, 'requests_per_s')
+    return results
@@ -0,0 +1,59 @@
+import time
+import cv2
+import numpy as np
+from api.service.inference_engine import CONFIDENCE, letterbox, prepare_frame
+from api.service.model_export import dataset_images
+from api.service.model_registry import MODEL_SPECS, load_model
+from benchmarks.report import summarize
+
+
+def load_corpus(name, limit=None):
+    """`name` मोडलको test split का तस्बिरहरू raw bytes मा (decode पनि मापन गर्न)।"""
+    corpus = []
+    for path in dataset_images(name, 'test', limit):
+        with open(path, 'rb') as f:
+            corpus.append((path, f.read()))
+    return corpus
+
+
+def _timed(fn, items, warmup=2):
+    for item in items[:warmup]:
+        fn(item)
+    latencies = []
+    started = time.perf_counter()
+    for item in items:
+        t0 = time.perf_counter()
+        fn(item)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run_micro(names=None, backend=None, limit=None, repeat=1):
+    """
+    प्रत्येक मोडलको तालिमकै imgsz मा decode, preprocess (shared resize + letterbox +
+    normalize) र inference (model.predict) छुट्टाछुट्टै मापन गर्छ।
+    """
+    results = {}
+    for name in names or sorted(MODEL_SPECS):
+        imgsz = MODEL_SPECS[name]['imgsz']
+        corpus = [data for _, data in load_corpus(name, limit)] * repeat
+        if not corpus:
+            print(f'No test images for {name}; skipping')
+            continue
+
+        frames = [cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR) for data in corpus]
+
+        def preprocess(frame):
+            image, _, _ = letterbox(prepare_frame(frame), imgsz)
+            return np.ascontiguousarray(image[:, :, ::-1].transpose(2, 0, 1), dtype=np.float32) / 255.0
+
+        model = load_model(name, backend)
+
+        def infer(frame):
+            return model.predict(source=frame, imgsz=imgsz, conf=CONFIDENCE, save=False, verbose=False)
+
+        results[f'{name}.decode'] = _timed(lambda data: cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR), corpus)
+        results[f'{name}.preprocess@{imgsz}'] = _timed(preprocess, frames)
+        # Production मा जस्तै shared (prepare_frame गरिएको) frame मा inference
+        results[f'{name}.inference@{imgsz}'] = _timed(infer, [prepare_frame(frame) for frame in frames])
+    return results
@@ -0,0 +1,57 @@
+import time
+from api.service.dataset_pack import PackedDataset
+from api.service.inference_engine import CONFIDENCE
+from api.service.model_registry import MODEL_SPECS, get_backend, load_model
+from api.service.tiled_inference import result_boxes
+from benchmarks.accuracy import MAP_CONFIDENCE, accuracy_metrics
+from benchmarks.report import summarize
+
+
+def run_packed(names=None, backend=None, split='test', root=None, limit=None):
+    """
+    `flask detections pack-datasets` ले बनाएका packed splits मा configured backend
+    (INFERENCE_BACKEND) को per-image latency र precision/recall (production CONFIDENCE मा),
+    र MAP_CONFIDENCE मा चलाइएको छुट्टै pass बाट mAP50। तस्बिरहरू पहिल्यै imgsz मा
+    letterboxed हुन्छन्, त्यसैले JPEG decode/resize बिना model मात्र मापन हुन्छ।
+    """
+    backend = backend or get_backend()
+    results = {}
+    for name in names or sorted(MODEL_SPECS):
+        try:
+            dataset = PackedDataset(name, split, root)
+        except FileNotFoundError as e:
+            print(f'{e}; skipping')
+            continue
+        if dataset.is_stale():
+            print(f'Warning: packed {name}/{split} is older than the source dataset; re-run pack-datasets')
+
+        imgsz = dataset.imgsz
+        model = load_model(name, backend)
+        count = min(len(dataset), limit) if limit else len(dataset)
+        # पहिलो call को lazy init (kernels, buffers) latency मा नगनियोस्
+        model.predict(source=dataset[0][0], imgsz=imgsz, conf=CONFIDENCE, save=False, verbose=False)
+
+        def predict(image, conf):
+            result = model.predict(source=image, imgsz=imgsz, conf=conf, save=False, verbose=False)[0]
+            xyxy, scores, classes = result_boxes(result)
+            return xyxy / imgsz, scores, classes.astype(int)
+
+        latencies, samples, map_samples = [], [], []
+        started = time.perf_counter()
+        for index in range(count):
+            image, gt_xyxy, gt_cls = dataset[index]
+            t0 = time.perf_counter()
+            prediction = predict(image, CONFIDENCE)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            samples.append((prediction, (gt_xyxy, gt_cls)))
+        elapsed = time.perf_counter() - started
+
+        # mAP50 का लागि छुट्टै (untimed) pass: पूरा PR curve
+        for index in range(count):
+            image, gt_xyxy, gt_cls = dataset[index]
+            map_samples.append((predict(image, MAP_CONFIDENCE), (gt_xyxy, gt_cls)))
+
+        row = summarize(latencies, elapsed)
+        row.update(accuracy_metrics(map_samples, samples))
+        results[f'{name}.{split}[{backend}]@{imgsz}'] = row
+    return results
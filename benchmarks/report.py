@@ -0,0 +1,103 @@
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """यो process को अहिलेसम्मको peak RSS (MB); थाहा नभए None।"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux मा KB, macOS मा bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def summarize(latencies_ms, elapsed_s=None, items=None, errors=0, rate_key='images_per_s'):
+    """Latency samples बाट p50/p95/p99, mean र throughput (images/s वा requests/s)।"""
+    summary = {'count': len(latencies_ms), 'errors': errors}
+    if latencies_ms:
+        values = np.asarray(latencies_ms, dtype=np.float64)
+        summary.update({
+            'mean_ms': round(float(values.mean()), 3),
+            'p50_ms': round(float(np.percentile(values, 50)), 3),
+            'p95_ms': round(float(np.percentile(values, 95)), 3),
+            'p99_ms': round(float(np.percentile(values, 99)), 3),
+            'max_ms': round(float(values.max()), 3)
+        })
+    if elapsed_s:
+        summary['elapsed_s'] = round(elapsed_s, 3)
+        summary[rate_key] = round((items if items is not None else len(latencies_ms)) / elapsed_s, 2)
+    return summary
+
+
+def environment():
+    from api.service.model_registry import get_backend
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'backend': get_backend(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def save_baseline(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def compare(results, baseline_path, threshold=0.10):
+    """
+    Baseline सँग तुलना: p95 latency `threshold` भन्दा बढी बढेको वा images/s त्यति नै
+    घटेको scenario लाई regression मानिन्छ। (scenario, metric, old, new) सूची फर्काउँछ।
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for section in ('micro', 'load', 'adaptive', 'packed'):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if not previous:
+                continue
+            old, new = previous.get('p95_ms'), current.get('p95_ms')
+            if old and new and new > old * (1 + threshold):
+                regressions.append((f'{section}.{name}', 'p95_ms', old, new))
+            for rate_key in ('images_per_s', 'requests_per_s'):
+                old, new = previous.get(rate_key), current.get(rate_key)
+                if old and new and new < old * (1 - threshold):
+                    regressions.append((f'{section}.{name}', rate_key, old, new))
+            old, new = previous.get('map50'), current.get('map50')
+            if old and new is not None and new < old * (1 - threshold):
+                regressions.append((f'{section}.{name}', 'map50', old, new))
+    return regressions
+
+
+def print_table(results):
+    for section in ('micro', 'load', 'adaptive', 'packed'):
+        rows = results.get(section)
+        if not rows:
+            continue
+        print(f'\n[{section}]')
+        print(f"{'scenario':<34}{'n':>6}{'err':>5}{'p50':>10}{'p95':>10}{'p99':>10}{'per s':>10}")
+        for name, row in rows.items():
+            print(
+                f"{name:<34}{row['count']:>6}{row['errors']:>5}"
+                f"{row.get('p50_ms', float('nan')):>10.2f}{row.get('p95_ms', float('nan')):>10.2f}"
+                f"{row.get('p99_ms', float('nan')):>10.2f}"
+                f"{row.get('images_per_s', row.get('requests_per_s', float('nan'))):>10.2f}"
+            )
+    accuracy = {**results.get('adaptive', {}), **results.get('packed', {})}
+    if accuracy:
+        print(f"\n{'accuracy (P/R at conf 0.5)':<34}{'mAP50':>10}{'P':>10}{'R':>10}{'tiles':>10}")
+        for name, row in accuracy.items():
+            print(f"{name:<34}{row['map50']:>10.4f}{row['precision']:>10.4f}{row['recall']:>10.4f}{row.get('avg_tiles', 0):>10.2f}")
+    print(f"\npeak RSS: {results.get('peak_rss_mb')} MB")
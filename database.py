@@ -3,3 +3,25 @@ from flask_migrate import Migrate
 
 db = SQLAlchemy()
 migrate = Migrate()
+
+
+def engine_options(config):
+    """
+    DB_* config बाट SQLAlchemy engine options। Pool sizing र statement timeout server
+    databases (PostgreSQL) का लागि मात्र; SQLite (benchmarks/tests) मा pre-ping मात्र।
+    """
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    options = {'pool_pre_ping': True}
+    if uri.startswith('sqlite'):
+        return options
+
+    options.update(
+        pool_size=config['DB_POOL_SIZE'],
+        max_overflow=config['DB_MAX_OVERFLOW'],
+        pool_timeout=config['DB_POOL_TIMEOUT'],
+        pool_recycle=config['DB_POOL_RECYCLE']
+    )
+    if uri.startswith('postgresql') and config['DB_STATEMENT_TIMEOUT_MS'] > 0:
+        # हरेक connection मा server-side timeout: अड्किएको query ले worker/pool नथुनोस्
+        options['connect_args'] = {'options': f"-c statement_timeout={int(config['DB_STATEMENT_TIMEOUT_MS'])}"}
+    return options
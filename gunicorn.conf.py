@@ -0,0 +1,22 @@
+# gunicorn -c gunicorn.conf.py wsgi:app
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 2))
+
+# मोडल master मा load गरेर fork गर्ने (wsgi.py हेर्नुहोस्)
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Warm-up प्रत्येक worker मा fork पछि मात्र: master मा inference चलाएर बनेका
+    # torch/OpenMP threads fork पछि सुरक्षित हुँदैनन्
+    from api.service.model_registry import warm_up
+    warm_up()
+
+
+def worker_exit(server, worker):
+    # Graceful shutdown मा write-behind buffer मा बाँकी records commit गर्ने (atexit को अतिरिक्त)
+    from api.service import write_buffer
+    if write_buffer._BUFFER is not None:
+        write_buffer._BUFFER.close()
@@ -0,0 +1,58 @@
+"""Store image paths as relative storage keys
+
+`detected_image_path` held absolute server paths and `image_name` a bare
+file name under uploads/<type>/original. Both become keys relative to the
+storage root (STORAGE_ROOT, default uploads/), so existing files keep
+resolving without being moved.
+
+Revision ID: b7e3a5c19f48
+Revises: e4b19d6a0c72
+Create Date: 2026-10-18 13:20:41.503117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3a5c19f48'
+down_revision = 'e4b19d6a0c72'
+branch_labels = None
+depends_on = None
+
+
+def _detected_key(detection_type, path):
+    marker = f'/{detection_type}/detected/'
+    normalized = path.replace('\\', '/')
+    if marker in normalized:
+        return normalized[normalized.rindex(marker) + 1:]
+    return f'{detection_type}/detected/{normalized.rsplit("/", 1)[-1]}'
+
+
+def _to_keys(table_name, detection_type):
+    connection = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('image_name', sa.String),
+        sa.column('detected_image_path', sa.String)
+    )
+    rows = connection.execute(sa.select(table.c.id, table.c.image_name, table.c.detected_image_path)).fetchall()
+    for row in rows:
+        values = {}
+        if row.image_name and '/' not in row.image_name:
+            values['image_name'] = f'{detection_type}/original/{row.image_name}'
+        if row.detected_image_path and (row.detected_image_path.startswith('/') or ':' in row.detected_image_path):
+            values['detected_image_path'] = _detected_key(detection_type, row.detected_image_path)
+        if values:
+            connection.execute(table.update().where(table.c.id == row.id).values(**values))
+
+
+def upgrade():
+    _to_keys('potholes', 'pothole')
+    _to_keys('wastes', 'waste')
+
+
+def downgrade():
+    # Keys storage root सापेक्ष मात्र हुन्; absolute paths फेरि बनाउन root थाहा हुँदैन
+    pass
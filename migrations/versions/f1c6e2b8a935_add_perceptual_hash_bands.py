@@ -0,0 +1,58 @@
+"""Add perceptual hash band columns for near-duplicate lookup
+
+The 64-bit dHash is split into four 16-bit bands; two hashes within 3 bits
+of each other share at least one band exactly. Band 0 is served by the
+existing perceptual_hash prefix index, bands 1-3 get their own indexes.
+
+Revision ID: f1c6e2b8a935
+Revises: d5a8c3e71b24
+Create Date: 2026-10-18 19:12:36.504118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c6e2b8a935'
+down_revision = 'd5a8c3e71b24'
+branch_labels = None
+depends_on = None
+
+_BANDS = ('perceptual_band1', 'perceptual_band2', 'perceptual_band3')
+
+
+def _backfill(table_name):
+    connection = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('perceptual_hash', sa.String),
+        *(sa.column(band, sa.String) for band in _BANDS)
+    )
+    rows = connection.execute(
+        sa.select(table.c.id, table.c.perceptual_hash).where(table.c.perceptual_hash.isnot(None))
+    ).fetchall()
+    for row in rows:
+        # api.service.dedup_cache.perceptual_bands जस्तै: 4 hex अक्षरका टुक्रा
+        values = {band: row.perceptual_hash[4 * i:4 * i + 4] for i, band in enumerate(_BANDS, 1)}
+        connection.execute(table.update().where(table.c.id == row.id).values(**values))
+
+
+def upgrade():
+    for table_name in ('potholes', 'wastes'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for band in _BANDS:
+                batch_op.add_column(sa.Column(band, sa.String(length=4), nullable=True))
+                batch_op.create_index(batch_op.f(f'ix_{table_name}_{band}'), [band], unique=False)
+
+    _backfill('potholes')
+    _backfill('wastes')
+
+
+def downgrade():
+    for table_name in ('wastes', 'potholes'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            for band in _BANDS:
+                batch_op.drop_index(batch_op.f(f'ix_{table_name}_{band}'))
+                batch_op.drop_column(band)
@@ -0,0 +1,293 @@
+"""
+Model weights वा database नचाहिने deterministic भागहरूका tests:
+geohash, keyset cursor, NMS / ROI tiles / tile merge, storage keys, admission queue, dHash lookup।
+
+    python -m pytest
+"""
+import threading
+import time
+import numpy as np
+import pytest
+from api.service.admission import AdmissionController, AdmissionRejected
+from api.service.dedup_cache import DetectionCache, hamming_distance, perceptual_bands
+from api.service.geo import bbox_around, covering_cells, geohash_encode, haversine_m
+from api.service.query_service import decode_cursor, encode_cursor
+from api.service.storage import LocalStorage, StorageError, content_key
+from api.service.tiled_inference import adaptive_predict, nms, roi_tiles, tiling_params
+
+
+# ---------------- Geohash ----------------
+def test_geohash_encode_known_value():
+    assert geohash_encode(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+    assert geohash_encode(42.6, -5.6, 5) == 'ezs42'
+
+
+def test_geohash_encode_missing_coordinates():
+    assert geohash_encode(None, 85.3) is None
+    assert geohash_encode(27.7, None) is None
+
+
+def test_covering_cells_contain_every_point_in_bbox():
+    min_lat, min_lon, max_lat, max_lon = bbox_around(27.7, 85.3, 1500)
+    cells = covering_cells(min_lat, min_lon, max_lat, max_lon)
+    assert 0 < len(cells) <= 32
+    for lat in np.linspace(min_lat, max_lat, 15):
+        for lon in np.linspace(min_lon, max_lon, 15):
+            geohash = geohash_encode(lat, lon)
+            assert any(geohash.startswith(cell) for cell in cells)
+
+
+def test_bbox_around_covers_radius():
+    min_lat, min_lon, max_lat, max_lon = bbox_around(27.7, 85.3, 1000)
+    assert haversine_m(27.7, 85.3, max_lat, 85.3) == pytest.approx(1000, rel=1e-3)
+    assert haversine_m(27.7, 85.3, 27.7, max_lon) == pytest.approx(1000, rel=1e-3)
+    assert min_lat < 27.7 < max_lat and min_lon < 85.3 < max_lon
+
+
+# ---------------- Keyset cursor ----------------
+def test_cursor_round_trip():
+    positions = {'pothole': 120, 'waste': 7}
+    cursor = encode_cursor(positions)
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == positions
+
+
+@pytest.mark.parametrize('cursor', [
+    'not-base64!!',
+    encode_cursor({'road': 1}),
+    encode_cursor({'pothole': '5'}),
+    encode_cursor([1, 2])
+])
+def test_cursor_rejects_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+# ---------------- NMS र tiles ----------------
+def test_nms_suppresses_overlap_within_class_only():
+    xyxy = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [1, 1, 11, 11], [50, 50, 60, 60]], dtype=np.float32)
+    scores = np.array([0.6, 0.9, 0.8, 0.5], dtype=np.float32)
+    classes = np.array([0, 0, 1, 0], dtype=np.float32)
+    keep = nms(xyxy, scores, classes, 0.5)
+    assert list(keep) == [1, 2, 3]
+
+
+def test_nms_empty():
+    empty = np.zeros((0, 4), dtype=np.float32)
+    assert len(nms(empty, np.zeros(0), np.zeros(0), 0.5)) == 0
+
+
+def test_roi_tiles_cover_candidates_inside_image():
+    params = tiling_params('pothole')
+    shape = (3000, 4000, 3)
+    candidates = np.array([[3900, 2900, 3990, 2990], [100, 100, 200, 200]], dtype=np.float32)
+    tiles = roi_tiles(candidates, np.array([0.3, 0.9], dtype=np.float32), shape, params)
+
+    assert 0 < len(tiles) <= params['max_tiles']
+    for x0, y0, x1, y1 in tiles:
+        assert 0 <= x0 < x1 <= 4000 and 0 <= y0 < y1 <= 3000
+        assert (x1 - x0, y1 - y0) == (params['tile_size'], params['tile_size'])
+    for cx1, cy1, cx2, cy2 in candidates:
+        assert any(x0 <= cx1 and y0 <= cy1 and cx2 <= x1 and cy2 <= y1 for x0, y0, x1, y1 in tiles)
+    # उच्च score भएको candidate को tile पहिले
+    assert tiles[0][:2] == (0, 0)
+
+
+def test_roi_tiles_respect_max_tiles():
+    params = tiling_params('waste', {'waste': {'max_tiles': 2}})
+    candidates = np.array([[x, 10, x + 50, 60] for x in range(0, 3000, 500)], dtype=np.float32)
+    tiles = roi_tiles(candidates, np.linspace(0.9, 0.2, len(candidates)).astype(np.float32), (2000, 3000), params)
+    assert len(tiles) == 2
+
+
+class _Boxes:
+    def __init__(self, data):
+        self.data = np.asarray(data, dtype=np.float32).reshape(-1, 6)
+        self.xyxy, self.conf, self.cls = self.data[:, :4], self.data[:, 4], self.data[:, 5]
+
+    def __len__(self):
+        return len(self.data)
+
+
+class _Result:
+    def __init__(self, image, data):
+        self.orig_img = image
+        self.orig_shape = image.shape[:2]
+        self.boxes = _Boxes(data)
+
+    def new(self):
+        return _Result(self.orig_img, np.zeros((0, 6)))
+
+    def update(self, boxes):
+        self.boxes = _Boxes(boxes)
+
+
+class _StubModel:
+    """Low-res pass मा एउटा box र हरेक tile मा (tile को coordinates मा) एउटा box फर्काउने।"""
+
+    def __init__(self, coarse, tile_box):
+        self.coarse = coarse
+        self.tile_box = tile_box
+        self.tiles = []
+
+    def predict(self, source, conf, **kwargs):
+        if isinstance(source, list):
+            self.tiles.extend(crop.shape for crop in source)
+            return [_Result(crop, [self.tile_box]) for crop in source]
+        return [_Result(source, [self.coarse])]
+
+
+def test_adaptive_predict_merges_tile_boxes_into_shared_coordinates():
+    frame = np.zeros((2560, 2560, 3), dtype=np.uint8)
+    shared = np.zeros((640, 640, 3), dtype=np.uint8)
+    params = tiling_params('pothole')
+    # Coarse box shared मा (100..140); tile ले उही वस्तु full-res मा अलि सटीक भेट्छ
+    model = _StubModel(coarse=[100, 100, 140, 140, 0.6, 0], tile_box=[402, 402, 562, 562, 0.9, 0])
+
+    result = adaptive_predict('pothole', model, frame, shared, 640, params, 0.5)
+
+    assert model.tiles == [(1280, 1280, 3)]
+    # Coarse र tile box एउटै वस्तु: NMS पछि उच्च score भएको tile box मात्र, shared scale (÷4) मा
+    assert len(result.boxes) == 1
+    np.testing.assert_allclose(result.boxes.data[0], [100.5, 100.5, 140.5, 140.5, 0.9, 0], atol=1e-4)
+
+
+def test_adaptive_predict_skips_tiles_for_small_frames():
+    frame = np.zeros((600, 600, 3), dtype=np.uint8)
+    model = _StubModel(coarse=[10, 10, 50, 50, 0.7, 1], tile_box=[0, 0, 1, 1, 0.9, 1])
+    result = adaptive_predict('waste', model, frame, frame, 320, tiling_params('waste'), 0.5)
+    assert model.tiles == []
+    assert len(result.boxes) == 1
+
+
+# ---------------- Storage ----------------
+def test_content_key_is_sharded_content_hash():
+    key = content_key('pothole/original', b'abc', '.JPG')
+    digest = 'ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad'
+    assert key == f'pothole/original/ba/78/{digest}.jpg'
+    assert content_key('pothole/original', b'abc', '.jpg') == key
+    assert content_key('pothole/original', b'abd', '.jpg') != key
+
+
+def test_local_storage_round_trip(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    key = content_key('waste/detected', b'image bytes', '.jpg')
+    assert storage.save(key, b'image bytes') == key
+    assert storage.exists(key)
+    assert storage.read(key) == b'image bytes'
+    assert storage.local_path(key) == str(tmp_path / key)
+
+    storage.delete(key)
+    assert not storage.exists(key)
+    assert storage.read(key) is None
+    storage.delete(key)
+
+
+@pytest.mark.parametrize('key', ['../outside.jpg', 'pothole/../../outside.jpg', '/etc/passwd', '..'])
+def test_local_storage_rejects_path_traversal(tmp_path, key):
+    storage = LocalStorage(str(tmp_path / 'root'))
+    with pytest.raises(StorageError):
+        storage.save(key, b'x')
+    with pytest.raises(StorageError):
+        storage.read(key)
+    assert not (tmp_path / 'outside.jpg').exists()
+
+
+# ---------------- Perceptual dedup ----------------
+def test_perceptual_bands_and_distance():
+    assert perceptual_bands('0123456789abcdef') == ['0123', '4567', '89ab', 'cdef']
+    assert hamming_distance('0123456789abcdef', '0123456789abcdef') == 0
+    assert hamming_distance('0123456789abcdef', '1123456789abcdee') == 2
+    assert hamming_distance('0000000000000000', 'ffffffffffffffff') == 64
+
+
+def test_cache_similar_finds_nearest_within_distance():
+    cache = DetectionCache(maxsize=3)
+    cache.put('p:0123456789abcdef', ('pothole', 1))
+    cache.put('p:0123456789abcde0', ('waste', 2))
+    cache.put('deadbeef', ('waste', 3))
+
+    # पहिलो र अन्तिम band फरक (2 bits) भए पनि बीचका bands मिल्छन्
+    assert cache.similar('1123456789abcdee', 3) == 'p:0123456789abcdef'
+    assert cache.similar('0123456789abcde1', 3) == 'p:0123456789abcde0'
+    assert cache.similar('ffff456789abcdef', 3) is None
+
+    # LRU बाट निकालिएको key band index बाट पनि हट्छ
+    cache.put('other', ('waste', 4))
+    assert cache.get('p:0123456789abcdef') is None
+    assert cache.similar('0123456789abcdef', 0) is None
+    cache.discard('p:0123456789abcde0')
+    assert cache.similar('0123456789abcde0', 3) is None
+
+
+# ---------------- Admission ----------------
+def _acquire_in_thread(controller, timeout_s=None):
+    outcome = {}
+
+    def run():
+        try:
+            outcome['waited'] = controller.acquire(timeout_s)
+        except AdmissionRejected as e:
+            outcome['rejected'] = e.reason
+        outcome['at'] = time.perf_counter()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+
+def _wait_for_queue(controller, depth):
+    deadline = time.perf_counter() + 5
+    while controller.queue_depth() < depth:
+        assert time.perf_counter() < deadline, 'waiter never queued'
+        time.sleep(0.001)
+
+
+def test_admission_queues_then_rejects_when_full():
+    controller = AdmissionController(max_concurrent=1, max_queue=1)
+    assert controller.acquire() == 0.0
+
+    thread, outcome = _acquire_in_thread(controller)
+    _wait_for_queue(controller, 1)
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire()
+    assert rejected.value.reason == 'queue_full'
+    assert rejected.value.retry_after >= 1
+
+    controller.release(0.01)
+    thread.join(5)
+    assert 'waited' in outcome
+    stats = controller.stats()
+    assert (stats['active'], stats['queue_depth'], stats['admitted'], stats['queue_full']) == (1, 0, 2, 1)
+
+
+def test_admission_hands_slots_off_in_fifo_order():
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    controller.acquire()
+    waiters = []
+    for depth in range(1, 4):
+        waiters.append(_acquire_in_thread(controller))
+        _wait_for_queue(controller, depth)
+
+    for _ in waiters:
+        controller.release(0.01)
+        time.sleep(0.01)
+    for thread, _ in waiters:
+        thread.join(5)
+    finish_order = sorted(range(len(waiters)), key=lambda i: waiters[i][1]['at'])
+    assert finish_order == [0, 1, 2]
+    assert controller.stats()['max_queue'] is None
+
+
+def test_admission_deadline():
+    controller = AdmissionController(max_concurrent=1, max_queue=4)
+    controller.acquire()
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire(timeout_s=0)
+    assert rejected.value.reason == 'deadline'
+
+    thread, outcome = _acquire_in_thread(controller, timeout_s=0.05)
+    thread.join(5)
+    assert outcome['rejected'] == 'deadline'
+    assert controller.queue_depth() == 0
+    assert controller.stats()['deadline'] == 2
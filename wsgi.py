@@ -0,0 +1,13 @@
+"""
+Production entry point:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+`preload_app` ले यो module master process मा एक पटक मात्र import गर्छ। मोडलहरू यहीँ
+fork अघि load हुन्छन्, त्यसैले weights सबै workers बीच copy-on-write ले share हुन्छन्।
+"""
+from app import create_app
+from api.service.model_registry import load_models
+
+app = create_app()
+load_models()